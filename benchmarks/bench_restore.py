@@ -0,0 +1,47 @@
+"""
+Benchmark session restore: CSV round trip vs. the binary course snapshot
+
+Usage: python benchmarks/bench_restore.py [rows ...]
+"""
+
+import io
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import pandas as pd
+
+from transcripts import make_transcript
+from utils.store import CourseStore
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+
+
+def best_of(fn, repeat=3):
+    """Return the fastest wall-clock time of `repeat` calls."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(sizes):
+    print(f"{'rows':>10}  {'csv restore':>12}  {'snapshot restore':>16}  {'csv size':>10}  {'snapshot size':>13}")
+    for rows in sizes:
+        store = CourseStore.from_frame(make_transcript(rows))
+        csv_data = store.frame().to_csv(index=False)
+        snapshot = store.snapshot()
+
+        csv_time = best_of(lambda: CourseStore.from_frame(pd.read_csv(io.StringIO(csv_data))))
+        snapshot_time = best_of(lambda: CourseStore.from_snapshot(snapshot).frame())
+
+        print(f"{rows:>10,}  {csv_time * 1000:>10.1f}ms  {snapshot_time * 1000:>14.1f}ms  "
+              f"{len(csv_data) / 1e6:>8.1f}MB  {len(snapshot) / 1e6:>11.1f}MB")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
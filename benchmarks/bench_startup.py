@@ -0,0 +1,85 @@
+"""
+Benchmark app cold start: time to import the Streamlit script in a fresh interpreter
+
+Each run starts a new `python -X importtime -c "import app"` process, so
+nothing is shared between runs except the bytecode cache. Reports the
+fastest run and which packages the import time went to, and checks that the
+heavy packages the views load on demand stay out of startup.
+
+Usage: python benchmarks/bench_startup.py [--repeat N] [--top N] [--max-ms MS]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+# Packages that only some views need; importing the app must not load them
+DEFERRED_PACKAGES = ['plotly.express', 'sklearn', 'matplotlib', 'kaleido']
+
+_IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)$')
+
+
+def run_import(module='app'):
+    """Import `module` in a fresh interpreter; return (wall seconds, [(self_us, cumulative_us, depth, name)])."""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=SRC_DIR, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((int(self_us), int(cumulative_us), (len(indent) - 1) // 2, name))
+    return wall, entries
+
+
+def package_times(entries):
+    """Total self time per top-level package, largest first."""
+    totals = defaultdict(int)
+    for self_us, _, _, name in entries:
+        totals[name.split('.')[0]] += self_us
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the app's cold-start import time.")
+    parser.add_argument('--repeat', type=int, default=5, help="fresh interpreters to start (best is reported)")
+    parser.add_argument('--top', type=int, default=10, help="packages to list by import time")
+    parser.add_argument('--max-ms', type=float, default=None, help="exit non-zero if `import app` takes longer")
+    args = parser.parse_args(argv)
+
+    run_import()  # Warm the bytecode cache so the first run does not pay for compilation
+    runs = [run_import() for _ in range(args.repeat)]
+    wall, entries = min(runs, key=lambda run: run[0])
+    app_ms = next(cumulative for _, cumulative, depth, name in entries if name == 'app' and depth == 0) / 1000
+    loaded = {name for _, _, _, name in entries}
+
+    print(f"{'import app':<24}{app_ms:>10.1f}ms")
+    print(f"{'interpreter wall time':<24}{wall * 1000:>10.1f}ms")
+    print()
+    print(f"{'package':<24}{'self time':>12}")
+    for package, self_us in package_times(entries)[:args.top]:
+        print(f"{package:<24}{self_us / 1000:>10.1f}ms")
+    print()
+
+    eager = [name for name in DEFERRED_PACKAGES if name in loaded]
+    for name in DEFERRED_PACKAGES:
+        print(f"{name:<24}{'loaded at startup' if name in eager else 'deferred':>18}")
+
+    if eager or (args.max_ms is not None and app_ms > args.max_ms):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
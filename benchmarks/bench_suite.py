@@ -0,0 +1,247 @@
+"""
+Benchmark suite for the GPA helpers, the course store and the render functions
+
+Times each case on synthetic transcripts of several sizes, writes the results
+as JSON and, when a baseline file exists, flags cases that got slower than
+the baseline by more than the threshold. The render cases run the real view
+functions against a fake `streamlit`, so they measure data preparation and
+figure building only.
+
+Usage:
+    python benchmarks/bench_suite.py [--sizes 10 1000 ...] [--only NAME ...]
+    python benchmarks/bench_suite.py --update-baseline   # after an intended change
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(os.path.dirname(BENCH_DIR), 'src'))
+
+import fake_streamlit
+
+st = fake_streamlit.install()
+
+import numpy as np
+import pandas as pd
+
+import app
+from components.dashboard import render_dashboard
+from transcripts import make_transcript
+from utils import helpers
+from utils.cache import clear_shared_caches
+from utils.constants import DIFFICULTY_LEVELS
+from utils.planner import plan_study_week
+from utils.store import CourseStore
+
+DEFAULT_SIZES = [10, 1_000, 100_000, 1_000_000]
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+DEFAULT_OUTPUT = os.path.join(RESULTS_DIR, 'latest.json')
+DEFAULT_BASELINE = os.path.join(RESULTS_DIR, 'baseline.json')
+
+# A case is slower than its baseline when it takes this much longer, and by at least NOISE_FLOOR seconds
+DEFAULT_THRESHOLD = 1.25
+NOISE_FLOOR = 0.0005
+
+# Scenario overrides per simulate_gpa call, like a user editing a few grades
+SIMULATED_OVERRIDES = 10
+# Study-time recommendations per timed call; one call is too fast to time on its own
+STUDY_TIME_CALLS = 1_000
+
+
+def new_session(store):
+    """Reset the fake session state to a fresh session holding `store`."""
+    st.reset()
+    for key, value in app.PERSISTENT_WIDGET_DEFAULTS.items():
+        st.session_state[key] = value
+    st.session_state.course_store = store
+
+
+def _overrides(df, seed=0):
+    rng = np.random.default_rng(seed)
+    count = min(SIMULATED_OVERRIDES, len(df))
+    positions = rng.choice(len(df), count, replace=False)
+    return {df.index[i]: grade for i, grade in zip(positions, rng.choice(['A', 'F'], count))}
+
+
+def _study_times():
+    for i in range(STUDY_TIME_CALLS):
+        helpers.recommend_study_time(DIFFICULTY_LEVELS[i % len(DIFFICULTY_LEVELS)], i % 6 + 1, 'A')
+
+
+def _plan_setup(df):
+    # Every transcript row becomes a planned course, aiming for the grade it earned
+    difficulties = np.array(DIFFICULTY_LEVELS, dtype=object)[np.arange(len(df)) % len(DIFFICULTY_LEVELS)]
+    return df[['Course Name', 'Credits']].assign(Difficulty=difficulties, **{'Target Grade': df['Grade']})
+
+
+def _cold(func):
+    # Time a memoized function's real work rather than a shared-cache hit
+    def run(df):
+        clear_shared_caches()
+        return func(df)
+    return run
+
+
+def _render_cold(render):
+    # Setup builds the store once; each timed call starts a new session with empty shared caches
+    def setup(df):
+        return CourseStore.from_frame(df)
+
+    def run(store):
+        clear_shared_caches()
+        new_session(store)
+        render()
+    return setup, run
+
+
+def _render_new_session(render):
+    # Another session opening the same transcript: only the process-wide caches are warm
+    def setup(df):
+        store = CourseStore.from_frame(df)
+        new_session(store)
+        render()
+        return store
+
+    def run(store):
+        new_session(store)
+        render()
+    return setup, run
+
+
+def _render_warm(render):
+    # A rerun of an unchanged page: the session's caches are already filled
+    def setup(df):
+        store = CourseStore.from_frame(df)
+        new_session(store)
+        render()
+        return store
+
+    def run(store):
+        render()
+    return setup, run
+
+
+def _store_setup(df):
+    return CourseStore.from_frame(df)
+
+
+# name -> (setup(df) -> state, run(state), largest size or None)
+CASES = {
+    'calculate_gpa': (lambda df: df, helpers.calculate_gpa, None),
+    'semester_gpa_table': (lambda df: df, _cold(helpers.semester_gpa_table), None),
+    'semester_gpa_table (shared hit)': (lambda df: df, helpers.semester_gpa_table, None),
+    'helpers.add_course': (lambda df: df, lambda df: helpers.add_course(df, 'Semester 1.1', 'CS101', 'Intro', 3, 'A'),
+                           None),
+    'helpers.delete_course': (lambda df: df, lambda df: helpers.delete_course(df, df.index[0]), None),
+    'store.add_course': (_store_setup, lambda store: store.add_course('Semester 1.1', 'CS101', 'Intro', 3, 'A'),
+                         None),
+    'store.delete_course': (_store_setup, lambda store: store.delete_course(0), None),
+    'simulate_gpa': (lambda df: (df, _overrides(df)), lambda state: helpers.simulate_gpa(*state), None),
+    f'recommend_study_time x{STUDY_TIME_CALLS}': (lambda df: None, lambda state: _study_times(), None),
+    'plan_study_week': (_plan_setup, plan_study_week, None),
+    'render_dashboard': (*_render_cold(render_dashboard), None),
+    'render_dashboard (new session)': (*_render_new_session(render_dashboard), None),
+    'render_dashboard (rerun)': (*_render_warm(render_dashboard), None),
+    'render_what_if_analysis': (*_render_cold(app.render_what_if_analysis), None),
+    'render_what_if_analysis (rerun)': (*_render_warm(app.render_what_if_analysis), None),
+}
+
+
+def time_case(setup, run, df, repeat):
+    """Run `setup` once and `run` `repeat` times; return (best, median) seconds."""
+    state = setup(df)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(state)
+        timings.append(time.perf_counter() - start)
+    return min(timings), statistics.median(timings)
+
+
+def run_suite(sizes, repeat, only=None, log=print):
+    """Time every case at every size it supports; return the JSON-ready results."""
+    results = {}
+    for rows in sizes:
+        df = make_transcript(rows)
+        for name, (setup, run, max_rows) in CASES.items():
+            if only and not any(pattern in name for pattern in only):
+                continue
+            if max_rows is not None and rows > max_rows:
+                continue
+            best, median = time_case(setup, run, df, repeat)
+            results[f"{name}@{rows}"] = {'case': name, 'rows': rows, 'best': best, 'median': median}
+            log(f"{name:<36}{rows:>10,}  {best * 1000:>10.3f}ms  {median * 1000:>10.3f}ms")
+    return results
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+    }
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return (key, baseline best, current best) for cases slower than the baseline."""
+    regressions = []
+    for key, result in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        if result['best'] > previous['best'] * threshold and result['best'] - previous['best'] > NOISE_FLOOR:
+            regressions.append((key, previous['best'], result['best']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the GPA helpers and render functions.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="transcript sizes in rows")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per case (best and median are kept)")
+    parser.add_argument('--only', nargs='+', help="run only cases whose name contains one of these")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="where to write the results JSON")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="slowdown ratio that counts as a regression")
+    parser.add_argument('--update-baseline', action='store_true', help="save these results as the new baseline")
+    args = parser.parse_args(argv)
+
+    print(f"{'case':<36}{'rows':>10}  {'best':>12}  {'median':>12}")
+    results = run_suite(args.sizes, args.repeat, args.only)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump({'environment': environment(), 'results': results}, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.update_baseline:
+        shutil.copyfile(args.output, args.baseline)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print("No baseline to compare against; run with --update-baseline to create one.")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline['results'], args.threshold)
+    print(f"Compared with {args.baseline} ({baseline['environment']['timestamp']})")
+    for key, before, after in regressions:
+        print(f"  REGRESSION {key}: {before * 1000:.3f}ms -> {after * 1000:.3f}ms ({after / before:.2f}x)")
+    if not regressions:
+        print("  No regressions")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+A do-nothing stand-in for `streamlit` so render functions can be timed headless
+
+Output calls (markdown, charts, tables, messages) are no-ops; widgets return
+the value in session state for their key, or their default; buttons are never
+pressed. What is left to time is the data preparation and figure building the
+render functions do before handing results to Streamlit.
+
+Call `install()` before importing any app module.
+"""
+
+import sys
+import types
+
+
+class SessionState(dict):
+    """Session state with the attribute access Streamlit's proxy allows."""
+
+    def __getattr__(self, key):
+        try:
+            return self[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def __setattr__(self, key, value):
+        self[key] = value
+
+    def __delattr__(self, key):
+        del self[key]
+
+
+class Element:
+    """Absorbs any call, attribute access or `with` block."""
+
+    def __call__(self, *args, **kwargs):
+        return self
+
+    def __getattr__(self, name):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class StopScript(Exception):
+    """Raised by st.stop() and st.rerun()."""
+
+
+class FakeStreamlit(types.ModuleType):
+    """Module object that replaces `streamlit` in sys.modules."""
+
+    def __init__(self):
+        super().__init__('streamlit')
+        self.session_state = SessionState()
+        self.column_config = Element()
+        self.sidebar = self
+
+    def reset(self):
+        """Start a new session."""
+        self.session_state.clear()
+
+    def __getattr__(self, name):
+        # markdown, plotly_chart, dataframe, info, error, spinner, form, ...
+        return Element()
+
+    def _widget(self, key, default):
+        if key is not None and key in self.session_state:
+            return self.session_state[key]
+        if key is not None:
+            self.session_state[key] = default
+        return default
+
+    def columns(self, spec, **kwargs):
+        return [Element() for _ in range(spec if isinstance(spec, int) else len(spec))]
+
+    def tabs(self, labels):
+        return [Element() for _ in labels]
+
+    def selectbox(self, label, options, index=0, key=None, **kwargs):
+        options = list(options)
+        return self._widget(key, options[index] if options and index is not None else None)
+
+    def radio(self, label, options, index=0, key=None, **kwargs):
+        return self.selectbox(label, options, index, key)
+
+    def multiselect(self, label, options, default=None, key=None, **kwargs):
+        return self._widget(key, list(default or []))
+
+    def slider(self, label, min_value=None, max_value=None, value=None, key=None, **kwargs):
+        return self._widget(key, min_value if value is None else value)
+
+    def number_input(self, label, min_value=None, max_value=None, value=None, key=None, **kwargs):
+        return self._widget(key, (min_value or 0) if value is None else value)
+
+    def text_input(self, label, value="", key=None, **kwargs):
+        return self._widget(key, value)
+
+    def toggle(self, label, value=False, key=None, **kwargs):
+        return self._widget(key, value)
+
+    checkbox = toggle
+
+    def button(self, *args, **kwargs):
+        return False
+
+    form_submit_button = download_button = button
+
+    def file_uploader(self, *args, **kwargs):
+        return None
+
+    def data_editor(self, data, key=None, **kwargs):
+        if key is not None and key not in self.session_state:
+            self.session_state[key] = {'edited_rows': {}, 'added_rows': [], 'deleted_rows': []}
+        return data
+
+    def stop(self):
+        raise StopScript()
+
+    rerun = stop
+
+
+def install():
+    """Put a FakeStreamlit into sys.modules and return it."""
+    module = sys.modules.get('streamlit')
+    if not isinstance(module, FakeStreamlit):
+        module = sys.modules['streamlit'] = FakeStreamlit()
+    return module
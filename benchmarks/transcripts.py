@@ -0,0 +1,46 @@
+"""
+Synthetic transcripts for the benchmarks
+
+Real transcripts are lopsided: most courses sit in the first few semesters,
+a handful of subjects dominate, credits cluster around 3 and grades lean
+towards the top of the scale. The generators reproduce that shape so the
+benchmarks exercise the same category sizes the app sees.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.grading import get_scale
+
+SUBJECTS = ['CS', 'MA', 'PH', 'CH', 'EN', 'EC', 'BI', 'HI', 'PS', 'ME', 'EE', 'ST']
+CREDIT_WEIGHTS = {1: 0.05, 2: 0.10, 3: 0.55, 4: 0.20, 5: 0.06, 6: 0.04}
+
+
+def _zipf_weights(count, exponent):
+    weights = 1.0 / np.arange(1, count + 1) ** exponent
+    return weights / weights.sum()
+
+
+def grade_weights(scale=None, skew=1.2):
+    """Probabilities over the scale's grades, falling off from the best grade."""
+    return _zipf_weights(len(get_scale(scale).grades), skew)
+
+
+def make_transcript(rows, seed=0, scale=None, semesters=12, grade_skew=1.2, semester_skew=0.8):
+    """Build a synthetic transcript with `rows` courses and skewed grade/semester distributions."""
+    scale = get_scale(scale)
+    rng = np.random.default_rng(seed)
+    labels = [f"Semester {year}.{term}" for year in range(1, semesters // 2 + 2) for term in (1, 2)][:semesters]
+
+    subjects = rng.choice(SUBJECTS, rows, p=_zipf_weights(len(SUBJECTS), 1.0))
+    numbers = rng.integers(100, 500, rows)
+    codes = np.char.add(subjects.astype(str), numbers.astype(str))
+
+    return pd.DataFrame({
+        'Semester': rng.choice(labels, rows, p=_zipf_weights(len(labels), semester_skew)),
+        'Course Code': codes.astype(object),
+        'Course Name': np.char.add('Course ', numbers.astype(str)).astype(object),
+        'Credits': rng.choice(list(CREDIT_WEIGHTS), rows, p=list(CREDIT_WEIGHTS.values())),
+        'Grade': rng.choice(scale.grades, rows, p=grade_weights(scale, grade_skew)),
+        'Timestamp': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 10**7, rows), unit='s'),
+    })
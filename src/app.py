@@ -3,123 +3,189 @@ import os
 
 sys.path.append(os.path.dirname(__file__))
 
+import importlib.util
+
 import streamlit as st
 import pandas as pd
-try:
-    import plotly.express as px
-except ImportError:
+
+# Derived frames share memory with their source until written to (the default from pandas 3)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.options.mode.copy_on_write = True
+
+if importlib.util.find_spec('plotly') is None:
     st.error("Error: Plotly is not installed. Please install it using: pip install plotly")
     st.stop()
-from utils.constants import GRADE_POINTS, DIFFICULTY_LEVELS, SUBJECTS, STUDY_TIPS
-from datetime import datetime
-import numpy as np
 
 from styles.custom_css import apply_custom_css
-from utils.constants import GRADE_POINTS, DIFFICULTY_LEVELS, SUBJECTS, STUDY_TIPS
-from utils.helpers import calculate_gpa, add_course, delete_course, recommend_study_time, simulate_gpa
+from utils import MAX_CREDITS
+from utils.constants import DIFFICULTY_LEVELS, SUBJECTS, STUDY_TIPS, WEEK_DAYS
+from utils.helpers import simulate_gpa, simulate_retake_gpas
+from utils.planner import plan_study_week
+from utils.store import CourseStore
+from utils.cache import LRUCache
+from utils.persistence import DEFAULT_PROFILE, CourseLog, profile_log_path
+from utils.goals import plan_target_gpa
+from utils.grading import GRADING_SCALES, get_scale
+from utils.lazy import lazy_import
+from utils import profiling
+from components.charts import study_schedule_figure
 from components.dashboard import render_dashboard
 from components.course_management import render_manage_courses
+from components.cohort import render_cohort_dashboard
+from components.prediction import render_grade_prediction
+from components.profiling import render_profile_panel
 
-def save_courses_data(courses_df):
-    """Save courses data to Streamlit's session state."""
-    try:
-        # Convert DataFrame to CSV string
-        csv_data = courses_df.to_csv(index=False)
-        # Store in session state
-        st.session_state.courses_data = csv_data
-        return True
-    except Exception as e:
-        st.error(f"Error saving data: {e}")
-        return False
+# Plotly loads when a view first draws a chart rather than on every cold start
+px = lazy_import('plotly.express')
 
-def load_courses_data():
-    """Load courses data from Streamlit's session state."""
+# Goal plans kept per session, so reruns that keep the target and courses skip the solver
+GOAL_PLAN_CACHE_SIZE = 8
+
+def load_courses_data(course_log):
+    """Restore the course store from the binary snapshot and change log."""
     try:
-        if 'courses_data' in st.session_state:
-            # Load from session state
-            return pd.read_csv(pd.StringIO(st.session_state.courses_data))
-        return pd.DataFrame(columns=['Semester', 'Course Code', 'Course Name', 'Credits', 'Grade', 'Timestamp'])
+        return course_log.load()
     except Exception as e:
-        st.error(f"Error loading data: {e}")
-        return pd.DataFrame(columns=['Semester', 'Course Code', 'Course Name', 'Credits', 'Grade', 'Timestamp'])
+        # The log refuses to save after a failed load, so the empty store never overwrites the files
+        st.error(f"Error loading data: {e}. Changes made in this session will not be saved.")
+        return CourseStore()
+
+# Widget keys whose values survive while their view is hidden, seeded with their defaults
+PERSISTENT_WIDGET_DEFAULTS = {
+    'opt_max_daily_hours': 4.0,
+    'opt_study_weekends': True,
+    'goal_target_gpa': 3.5,
+    'goal_future_credits': 30,
+    'predict_credits': 3,
+    'cohort_predict_credits': 3,
+    'courses_ascending': True,
+}
+PERSISTENT_WIDGET_PREFIXES = ('opt_', 'goal_', 'retake_', 'courses_', 'cohort_', 'predict_')
 
 def initialize_session_state():
     """Initialize session state variables."""
-    if 'courses' not in st.session_state:
-        st.session_state.courses = load_courses_data()
+    for key, value in PERSISTENT_WIDGET_DEFAULTS.items():
+        if key not in st.session_state:
+            st.session_state[key] = value
+    if 'profile' not in st.session_state:
+        st.session_state.profile = st.query_params.get('profile', DEFAULT_PROFILE)
+    log_path = profile_log_path(st.session_state.profile)
+    if 'course_store' not in st.session_state:
+        course_log = CourseLog(log_path)
+        st.session_state.course_log = course_log
+        st.session_state.course_store = load_courses_data(course_log)
+    elif st.session_state.course_log.path != log_path:
+        # Another profile: reload in place, so every cache keyed on the store's version starts over
+        course_log = CourseLog(log_path)
+        st.session_state.course_log = course_log
+        st.session_state.course_store.replace_with(load_courses_data(course_log))
+
+def preserve_widget_state():
+    """Keep widget values of views that are not rendered on this run.
+
+    Streamlit drops the state of widgets that are not drawn during a run;
+    writing the value back marks it as user state so it outlives the rerun.
+    """
+    for key in list(st.session_state.keys()):
+        if isinstance(key, str) and key.startswith(PERSISTENT_WIDGET_PREFIXES):
+            st.session_state[key] = st.session_state[key]
 
 def render_study_optimizer():
     """Render the study optimizer tab."""
     st.markdown('<h2 class="section-header">Study Time Optimizer</h2>', unsafe_allow_html=True)
     st.write("Plan your study time effectively to achieve your target grades")
     
+    scale = get_scale(st.session_state.get("grading_scale"))
+    
+    # The editor starts from the last submitted plan; a new key per submission keeps its edits from replaying
+    if 'study_plan' not in st.session_state:
+        st.session_state.study_plan = pd.DataFrame({
+            'Course Name': pd.Series(dtype=object),
+            'Difficulty': pd.Series(dtype=object),
+            'Credits': pd.Series(dtype='int64'),
+            'Target Grade': pd.Series(dtype=object),
+        })
+    generation = st.session_state.get('study_plan_generation', 0)
+    
     with st.form("study_optimizer_form"):
-        col1, col2, col3 = st.columns(3)
+        st.write("List the courses you are taking this semester")
+        planned = st.data_editor(
+            st.session_state.study_plan,
+            key=f"study_plan_grid_{generation}",
+            num_rows="dynamic",
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                "Course Name": st.column_config.TextColumn("Course Name", required=True),
+                "Difficulty": st.column_config.SelectboxColumn("Difficulty", options=DIFFICULTY_LEVELS,
+                                                               default=DIFFICULTY_LEVELS[1], required=True),
+                "Credits": st.column_config.NumberColumn("Credits", min_value=1, max_value=6, step=1, default=3,
+                                                         required=True),
+                "Target Grade": st.column_config.SelectboxColumn("Target Grade", options=scale.grades,
+                                                                 default=scale.grades[0], required=True),
+            },
+        )
         
+        col1, col2 = st.columns(2)
         with col1:
-            course_name = st.text_input("Course Name", placeholder="Data Structures", key="opt_course_name")
-        
+            max_hours_per_day = st.number_input("Max study hours per day", min_value=0.5, max_value=16.0, step=0.5,
+                                                key="opt_max_daily_hours")
         with col2:
-            difficulty = st.selectbox("Course Difficulty", DIFFICULTY_LEVELS, key="opt_difficulty")
-            credits = st.number_input("Course Credits", min_value=1, max_value=6, value=3, key="opt_credits")
-        
-        with col3:
-            target_grade = st.selectbox("Target Grade", list(GRADE_POINTS.keys()), key="opt_target")
+            study_weekends = st.toggle("Study on weekends", key="opt_study_weekends")
         
         optimize_button = st.form_submit_button("Get Study Plan", type="primary")
-        
-        if optimize_button:
-            if course_name:
-                recommended_hours = recommend_study_time(difficulty, credits, target_grade)
-                # Validate recommended_hours
-                if (
-                    recommended_hours is None or
-                    not isinstance(recommended_hours, (int, float)) or
-                    (isinstance(recommended_hours, float) and np.isnan(recommended_hours)) or
-                    recommended_hours < 0
-                ):
-                    st.error("Could not generate a study plan. Please check your input or contact support.")
-                    return
-                st.markdown(f"""
-                <div style="background-color: #f0f7ff; padding: 20px; border-radius: 10px; border-left: 5px solid #1E88E5;">
-                    <h3 style="color: #0D47A1;">Recommended Study Plan for {course_name}</h3>
-                    <p>To achieve a target grade of <b>{target_grade}</b> in this {difficulty.lower()} {credits}-credit course, you should study:</p>
-                    <h2 style="color: #1E88E5; text-align: center;">{recommended_hours} hours/week</h2>
-                    <p>This recommendation is based on:</p>
-                    <ul>
-                        <li>Course difficulty level: {difficulty}</li>
-                        <li>Number of credits: {credits}</li>
-                        <li>Your target grade: {target_grade}</li>
-                    </ul>
-                    <p><small>Note: This is a general guideline. Adjust based on your learning style and the specific demands of the course.</small></p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Weekly schedule visualization
-                st.markdown("<br>", unsafe_allow_html=True)
-                st.markdown("<b>Suggested Weekly Schedule</b>", unsafe_allow_html=True)
-                
-                days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-                daily_hours = [round(recommended_hours / 5, 1) if i < 5 else 0 for i in range(7)]
-                
-                schedule_df = pd.DataFrame({
-                    'Day': days,
-                    'Study Hours': daily_hours
-                })
-                
-                fig = px.bar(schedule_df, x='Day', y='Study Hours', 
-                             title=f'Suggested Weekly Study Schedule for {course_name}',
-                             color='Study Hours',
-                             color_continuous_scale=px.colors.sequential.Blues)
-                
-                fig.update_layout(xaxis_title='Day of Week',
-                                 yaxis_title='Hours of Study',
-                                 plot_bgcolor='rgba(0,0,0,0)')
-                
-                st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.error("Please enter a course name.")
     
+    if not optimize_button:
+        return render_study_tips()
+    
+    st.session_state.study_plan = planned
+    st.session_state.study_plan_generation = generation + 1
+    
+    courses = planned[planned['Course Name'].fillna('').astype(str).str.strip() != ''].fillna({
+        'Difficulty': DIFFICULTY_LEVELS[1], 'Credits': 3, 'Target Grade': scale.grades[0],
+    })
+    if courses.empty:
+        st.error("Please add at least one course.")
+        return render_study_tips()
+    
+    days = WEEK_DAYS if study_weekends else WEEK_DAYS[:5]
+    try:
+        plan, calendar = plan_study_week(courses, max_hours_per_day, days=days, scale=scale)
+    except Exception as e:
+        st.error(f"Could not generate a study plan: {e}")
+        return render_study_tips()
+    
+    total_credits = int(plan['Credits'].sum())
+    weekly_hours = plan['Hours/Week'].sum()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Planned credits", f"{total_credits} / {MAX_CREDITS}")
+    col2.metric("Study hours per week", f"{weekly_hours:.1f}")
+    col3.metric("Study time available", f"{max_hours_per_day * len(days):.1f} h")
+    
+    if total_credits > MAX_CREDITS:
+        st.warning(f"{total_credits} credits is more than the {MAX_CREDITS}-credit maximum for a semester.")
+    unscheduled = plan['Unscheduled Hours'].sum()
+    if unscheduled > 0:
+        st.warning(f"{unscheduled:.1f} hours a week do not fit in {max_hours_per_day:g} hours a day. "
+                   "Raise the daily limit, study on weekends or lighten the course load.")
+    
+    st.dataframe(plan, use_container_width=True, hide_index=True,
+                 column_config={
+                     "Hours/Week": st.column_config.NumberColumn("Hours/Week", format="%.1f"),
+                     "Unscheduled Hours": st.column_config.NumberColumn("Unscheduled Hours", format="%.1f"),
+                 })
+    
+    # Weekly schedule visualization
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown("<b>Suggested Weekly Schedule</b>", unsafe_allow_html=True)
+    
+    if not calendar.empty:
+        st.plotly_chart(study_schedule_figure(calendar), use_container_width=True)
+    
+    render_study_tips()
+
+def render_study_tips():
+    """Render the subject study tips below the study optimizer."""
     # Study tips section
     st.markdown("<br>", unsafe_allow_html=True)
     st.markdown("<b>Study Strategy Recommendations</b>", unsafe_allow_html=True)
@@ -133,51 +199,80 @@ def render_study_optimizer():
             st.markdown(f"{i}. {tip}")
         st.markdown("</div>", unsafe_allow_html=True)
 
+def render_grade_override_grid(store, scenario_df, scale):
+    """Render the What-If grade editor and return the {index: new_grade} overrides."""
+    # Overrides are positional, so they only survive while the courses are unchanged
+    if st.session_state.get('what_if_version') != (store.version, scale.name):
+        st.session_state.what_if_version = (store.version, scale.name)
+        st.session_state.what_if_overrides = {}
+        st.session_state.what_if_generation = st.session_state.get('what_if_generation', 0) + 1
+    overrides = st.session_state.what_if_overrides
+    
+    grid = scenario_df[['Course Code', 'Course Name', 'Semester', 'Grade']].astype({'Semester': object, 'Grade': object})
+    grid['New Grade'] = grid['Grade']
+    if overrides:
+        grid.loc[list(overrides), 'New Grade'] = list(overrides.values())
+    
+    grid_key = f"what_if_grid_{st.session_state.what_if_generation}"
+    st.data_editor(
+        grid,
+        key=grid_key,
+        hide_index=True,
+        use_container_width=True,
+        height=min(400, 35 * (len(grid) + 1) + 3),
+        disabled=['Course Code', 'Course Name', 'Semester', 'Grade'],
+        column_config={
+            "Grade": st.column_config.TextColumn("Current Grade"),
+            "New Grade": st.column_config.SelectboxColumn("New Grade", options=scale.grades, required=True),
+        },
+    )
+    
+    # The editor reports only the edited cells, so folding them in costs O(changes)
+    for position, change in st.session_state[grid_key]['edited_rows'].items():
+        if 'New Grade' not in change:
+            continue
+        index = grid.index[position]
+        if change['New Grade'] == grid.at[index, 'Grade']:
+            overrides.pop(index, None)
+        else:
+            overrides[index] = change['New Grade']
+    
+    if overrides and st.button("Reset all grades"):
+        st.session_state.what_if_overrides = {}
+        st.session_state.what_if_generation += 1
+        st.rerun()
+    
+    return dict(overrides)
+
 def render_what_if_analysis():
     """Render the what-if analysis tab."""
     st.markdown('<h2 class="section-header">What-If Scenario Analysis</h2>', unsafe_allow_html=True)
     st.write("Explore how changes to your grades would affect your overall GPA")
     
-    if st.session_state.courses.empty:
+    store = st.session_state.course_store
+    if store.empty:
         st.info("Add some courses to use the What-If Analysis feature.")
         return
     
     # Display current GPA
-    current_gpa = calculate_gpa(st.session_state.courses)
+    scale = get_scale(st.session_state.get("grading_scale"))
+    aggregate = store.aggregate
+    current_gpa = aggregate.gpa(scale)
     st.markdown(f"<b>Your current GPA: {current_gpa:.2f}</b>", unsafe_allow_html=True)
     
-    # Create a DataFrame for scenario planning
-    scenario_df = st.session_state.courses.copy()
+    # Scenarios only read the courses, so the store's cached frame is used as is
+    scenario_df = store.frame()
     
     # Let the user select courses to modify
     st.markdown("<br>", unsafe_allow_html=True)
     st.markdown("<b>Modify Grades to See GPA Impact</b>", unsafe_allow_html=True)
     
-    # Store the modified grades
-    modified_grades = {}
-    
-    # Display courses for modification
-    for index, row in scenario_df.iterrows():
-        col1, col2, col3 = st.columns([3, 1, 1])
-        
-        with col1:
-            st.write(f"{row['Course Code']}: {row['Course Name']} ({row['Semester']})")
-        
-        with col2:
-            st.write(f"Current grade: {row['Grade']}")
-        
-        with col3:
-            new_grade = st.selectbox(f"New grade", 
-                                   list(GRADE_POINTS.keys()), 
-                                   index=list(GRADE_POINTS.keys()).index(row['Grade']),
-                                   key=f"what_if_{index}")
-            
-            if new_grade != row['Grade']:
-                modified_grades[index] = new_grade
+    # One grid for every course; only the rows the user changed come back as overrides
+    modified_grades = render_grade_override_grid(store, scenario_df, scale)
     
     # Calculate the new GPA
     if modified_grades:
-        new_gpa = simulate_gpa(scenario_df, modified_grades)
+        new_gpa = simulate_gpa(scenario_df, modified_grades, scale)
         gpa_change = new_gpa - current_gpa
         
         # Display the result
@@ -214,7 +309,7 @@ def render_what_if_analysis():
                      text='GPA',
                      title='GPA Comparison')
         
-        fig.update_layout(yaxis_range=[0, 4.0],
+        fig.update_layout(yaxis_range=[0, scale.max_points],
                          plot_bgcolor='rgba(0,0,0,0)')
         
         fig.update_traces(texttemplate='%{y:.2f}', textposition='outside')
@@ -235,161 +330,73 @@ def render_what_if_analysis():
         else:
             st.markdown("ℹ️ This scenario would result in **no change** to your GPA.")
         
-        # Goal-setting feature
-        st.markdown("<br>", unsafe_allow_html=True)
-        st.markdown("<b>GPA Goal Setting</b>", unsafe_allow_html=True)
-        
-        target_gpa = st.slider("What's your target GPA?", min_value=0.0, max_value=4.0, value=3.5, step=0.1)
+    # Goal-setting feature
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown("<b>GPA Goal Setting</b>", unsafe_allow_html=True)
+    
+    # A target carried over from a wider scale must fit the current one
+    st.session_state.goal_target_gpa = min(st.session_state.goal_target_gpa, scale.max_points)
+    target_gpa = st.slider("What's your target GPA?", min_value=0.0, max_value=scale.max_points, step=0.1,
+                           key="goal_target_gpa")
+    remaining_credits = st.number_input("Credits you still plan to take", min_value=0, max_value=200, step=3,
+                                        key="goal_future_credits")
+    
+    if target_gpa > current_gpa:
+        if 'target_plan_cache' not in st.session_state:
+            st.session_state.target_plan_cache = LRUCache(maxsize=GOAL_PLAN_CACHE_SIZE)
+        key = (id(store), store.version, target_gpa, remaining_credits, scale.name)
+        plan, projected_gpa = st.session_state.target_plan_cache.get_or_create(
+            key, lambda: plan_target_gpa(scenario_df, target_gpa, future_credits=remaining_credits, scale=scale))
         
-        if target_gpa > current_gpa:
-            gap = target_gpa - current_gpa
-            remaining_credits = 30  # Assumption for future credits
-            
-            # Calculate required GPA for future courses
-            current_points = current_gpa * st.session_state.courses['Credits'].sum()
-            target_points = target_gpa * (st.session_state.courses['Credits'].sum() + remaining_credits)
-            needed_points = target_points - current_points
-            required_future_gpa = needed_points / remaining_credits
+        if plan is not None:
+            st.markdown(f"""
+            <div style="background-color: #e8f5e9; padding: 15px; border-radius: 10px;">
+                <h4>To reach your target GPA of {target_gpa:.1f}:</h4>
+                <p>The smallest set of grade improvements takes <b>{int(plan['Steps'].sum())}</b> letter-grade steps
+                across <b>{len(plan)}</b> courses and lifts your GPA to <b>{projected_gpa:.2f}</b>.</p>
+            </div>
+            """, unsafe_allow_html=True)
             
-            if required_future_gpa <= 4.0:
-                st.markdown(f"""
-                <div style="background-color: #e8f5e9; padding: 15px; border-radius: 10px;">
-                    <h4>To reach your target GPA of {target_gpa:.1f}:</h4>
-                    <p>You'll need to maintain a <b>{required_future_gpa:.2f}</b> GPA in your next {remaining_credits} credits.</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Interpret the difficulty
-                if required_future_gpa > 3.7:
-                    st.write("This will be challenging and will require mostly A grades.")
-                elif required_future_gpa > 3.3:
-                    st.write("This is achievable with a mix of A and B+ grades.")
-                elif required_future_gpa > 3.0:
-                    st.write("This is realistic with solid B+ performance.")
-                else:
-                    st.write("This is very achievable with your current performance level.")
-            else:
-                st.markdown(f"""
-                <div style="background-color: #ffebee; padding: 15px; border-radius: 10px;">
-                    <h4>Target GPA Analysis:</h4>
-                    <p>Your target GPA of {target_gpa:.1f} is mathematically impossible to achieve with only {remaining_credits} remaining credits.</p>
-                    <p>Consider setting a more realistic goal or planning for additional coursework.</p>
-                </div>
-                """, unsafe_allow_html=True)
+            st.dataframe(plan, use_container_width=True, hide_index=True)
         else:
             st.markdown(f"""
-            <div style="background-color: #e8f5e9; padding: 15px; border-radius: 10px;">
-                <h4>Good news!</h4>
-                <p>Your current GPA of {current_gpa:.2f} already meets or exceeds your target of {target_gpa:.1f}.</p>
-                <p>Focus on maintaining your performance in future courses.</p>
+            <div style="background-color: #ffebee; padding: 15px; border-radius: 10px;">
+                <h4>Target GPA Analysis:</h4>
+                <p>Your target GPA of {target_gpa:.1f} is mathematically impossible to achieve with only {remaining_credits} remaining credits,
+                even with top grades everywhere (best possible: {projected_gpa:.2f}).</p>
+                <p>Consider setting a more realistic goal or planning for additional coursework.</p>
             </div>
             """, unsafe_allow_html=True)
-
-def render_manage_courses():
-    """Render the manage courses tab."""
-    st.markdown('<h2 class="section-header">Manage Your Courses</h2>', unsafe_allow_html=True)
+    else:
+        st.markdown(f"""
+        <div style="background-color: #e8f5e9; padding: 15px; border-radius: 10px;">
+            <h4>Good news!</h4>
+            <p>Your current GPA of {current_gpa:.2f} already meets or exceeds your target of {target_gpa:.1f}.</p>
+            <p>Focus on maintaining your performance in future courses.</p>
+        </div>
+        """, unsafe_allow_html=True)
     
-    # Form to add new courses
-    with st.form("add_course_form"):
-        st.markdown("Add a New Course")
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            semester = st.selectbox(
-                "Semester",
-                options=[
-                    "Semester 1.1", "Semester 1.2",
-                    "Semester 2.1", "Semester 2.2",
-                    "Semester 3.1", "Semester 3.2",
-                    "Semester 4.1", "Semester 4.2",
-                    "Semester 5.1", "Semester 5.2",
-                    "Semester 6.1", "Semester 6.2"
-                ],
-                help="Select the semester for this course"
-            )
-            course_name = st.text_input("Course Name", placeholder="Introduction to Computer Science")
-            grade = st.selectbox("Grade", list(GRADE_POINTS.keys()))
-        
-        with col2:
-            course_code = st.text_input("Course Code", placeholder="CS101")
-            credits = st.number_input("Credits", min_value=1, max_value=6, value=3)
-        
-        submit_button = st.form_submit_button("Add Course")
-        
-        if submit_button:
-            if semester and course_code and course_name:
-                st.session_state.courses = add_course(st.session_state.courses, semester, course_code, course_name, credits, grade)
-                if save_courses_data(st.session_state.courses):
-                    st.success(f"Added {course_name} to your courses!")
-                else:
-                    st.error("Course added but failed to save data.")
-            else:
-                st.error("Please fill in all required fields.")
-    
-    # Display and edit existing courses
+    # Retake planner: one single-course retake per course, computed from the column totals
     st.markdown("<br>", unsafe_allow_html=True)
-    st.markdown("<b>Your Courses</b>", unsafe_allow_html=True)
+    st.markdown("<b>Retake Planner</b>", unsafe_allow_html=True)
+    
+    retake_grade = st.selectbox("If I retake a course and earn", scale.grades, key="retake_grade")
+    retake_gpas = simulate_retake_gpas(scenario_df, retake_grade, scale)
     
-    if st.session_state.courses.empty:
-        st.info("No courses added yet. Use the form above to add your first course.")
+    retake_df = scenario_df[['Course Code', 'Course Name', 'Semester', 'Grade']].assign(**{
+        'New GPA': retake_gpas,
+        'GPA Change': retake_gpas - current_gpa,
+    })
+    retake_df = retake_df[retake_df['GPA Change'] > 0].nlargest(10, 'GPA Change')
+    
+    if retake_df.empty:
+        st.info(f"Retaking a course for a {retake_grade} would not raise your GPA.")
     else:
-        for index, row in st.session_state.courses.iterrows():
-            col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
-            
-            with col1:
-                st.write(f"**{row['Course Code']}**: {row['Course Name']}")
-            
-            with col2:
-                st.write(f"Semester: {row['Semester']}")
-            
-            with col3:
-                st.write(f"Credits: {row['Credits']}")
-                st.write(f"Grade: {row['Grade']}")
-            
-            with col4:
-                if st.button("Delete", key=f"delete_{index}"):
-                    st.session_state.courses = delete_course(st.session_state.courses, index)
-                    if save_courses_data(st.session_state.courses):
-                        st.success("Course deleted successfully!")
-                        st.rerun()
-                    else:
-                        st.error("Course deleted but failed to save data.")
-            
-            st.markdown("---")
-        
-        # Export functionality
-        st.download_button(
-            label="Export Course Data (CSV)",
-            data=st.session_state.courses.to_csv(index=False).encode('utf-8'),
-            file_name="my_courses.csv",
-            mime="text/csv",
-        )
-        
-        # Import functionality
-        st.markdown("<br>", unsafe_allow_html=True)
-        st.markdown("<b>Import Courses</b>", unsafe_allow_html=True)
-        uploaded_file = st.file_uploader("Upload a CSV file with your courses", type="csv")
-        
-        if uploaded_file is not None:
-            try:
-                imported_courses = pd.read_csv(uploaded_file)
-                required_columns = ['Semester', 'Course Code', 'Course Name', 'Credits', 'Grade']
-                
-                if all(col in imported_courses.columns for col in required_columns):
-                    if st.button("Confirm Import"):
-                        if 'Timestamp' not in imported_courses.columns:
-                            imported_courses['Timestamp'] = datetime.now()
-                        
-                        st.session_state.courses = pd.concat([st.session_state.courses, imported_courses], ignore_index=True)
-                        if save_courses_data(st.session_state.courses):
-                            st.success("Courses imported successfully!")
-                            st.rerun()
-                        else:
-                            st.error("Courses imported but failed to save data.")
-                else:
-                    st.error("The uploaded CSV does not have the required columns.")
-            except Exception as e:
-                st.error(f"Error importing courses: {e}")
+        st.dataframe(retake_df, use_container_width=True, hide_index=True,
+                     column_config={
+                         "New GPA": st.column_config.NumberColumn("New GPA", format="%.2f"),
+                         "GPA Change": st.column_config.NumberColumn("GPA Change", format="+%.2f"),
+                     })
 
 def main():
     """Main application entry point."""
@@ -399,27 +406,45 @@ def main():
     apply_custom_css()
     
     # Initialize session state
-    initialize_session_state()
+    profiling.begin_run()
+    with profiling.span('session_init'):
+        initialize_session_state()
+        preserve_widget_state()
+    store_bytes = st.session_state.course_store.nbytes if profiling.ENABLED else None
     
     # Main header
     st.markdown('<h1 class="main-header">📚 GPA Insight</h1>', unsafe_allow_html=True)
     st.markdown("Academic performance tracker and GPA optimizer")
     
-    # Create tabs (remove Grade Prediction tab)
-    tab1, tab2, tab3, tab4 = st.tabs(["Dashboard", "Manage Courses", "Study Optimizer", "What-If Analysis"])
-    
-    # Render each tab
-    with tab1:
-        render_dashboard()
+    # Each profile keeps its own saved courses; the URL keeps the profile across reloads
+    profile = st.sidebar.text_input("Profile", key="profile",
+                                    help="Courses are saved per profile. Sessions on the same profile share them.")
+    if st.query_params.get('profile', DEFAULT_PROFILE) != profile:
+        st.query_params['profile'] = profile
     
-    with tab2:
-        render_manage_courses()
+    # Grades are stored as labels, so switching scales only changes how they are scored
+    st.sidebar.selectbox("Grading scale", list(GRADING_SCALES), key="grading_scale",
+                         format_func=lambda name: GRADING_SCALES[name].label)
     
-    with tab3:
-        render_study_optimizer()
+    # Only the selected view runs; st.tabs would execute every tab body on each rerun
+    views = {
+        "Dashboard": render_dashboard,
+        "Manage Courses": render_manage_courses,
+        "Grade Prediction": render_grade_prediction,
+        "Study Optimizer": render_study_optimizer,
+        "What-If Analysis": render_what_if_analysis,
+        "Cohort": render_cohort_dashboard,
+    }
+    active_view = st.radio("View", list(views), horizontal=True, key="active_view", label_visibility="collapsed")
+    view = views[active_view]
+    with profiling.span(view.__name__):
+        view()
     
-    with tab4:
-        render_what_if_analysis()
+    if profiling.ENABLED:
+        # An import or edit can swap in a new store, so measure whichever one the session holds now
+        store_bytes_after = st.session_state.course_store.nbytes
+        profiling.end_run(store_bytes, store_bytes_after)
+        render_profile_panel(store_bytes, store_bytes_after)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""
+Figure and table builders for the dashboard charts
+"""
+
+import pandas as pd
+
+from utils.cache import memoize
+from utils.constants import WEEK_DAYS
+from utils.helpers import grade_points, semester_gpa_table
+from utils.grading import get_scale
+from utils.lazy import lazy_import
+from utils.profiling import timed
+
+# Imported when the first chart is built, not when the app starts
+px = lazy_import('plotly.express')
+
+# Figures are shared by every session, keyed by the columns each chart reads
+SHARED_FIGURE_CACHE = {'maxsize': 256, 'max_bytes': 64 << 20, 'ttl': 3600}
+
+
+@timed()
+@memoize('gpa_trend_figure', columns=['Semester', 'Credits', 'Grade'], **SHARED_FIGURE_CACHE)
+def gpa_trend_figure(courses, scale=None):
+    """Per-semester and cumulative GPA lines, or None when there is nothing to plot."""
+    scale = get_scale(scale)
+    semester_gpa_df = semester_gpa_table(courses, scale)
+    
+    if semester_gpa_df.empty:
+        return None
+    
+    fig = px.line(semester_gpa_df, x='Semester', y=['GPA', 'Cumulative GPA'], 
+                  markers=True, line_shape='linear',
+                  labels={'value': 'GPA', 'variable': '', 'Semester': 'Semester'},
+                  title='GPA Trend by Semester')
+    
+    fig.update_layout(xaxis_title='Semester',
+                     yaxis_title='GPA',
+                     yaxis_range=[0, scale.max_points],
+                     xaxis={'type': 'category'},
+                     plot_bgcolor='rgba(0,0,0,0)')
+    return fig
+
+
+@timed()
+@memoize('grade_distribution_figure', columns=['Grade'], **SHARED_FIGURE_CACHE)
+def grade_distribution_figure(courses, scale=None):
+    """Bar chart of how many courses earned each grade."""
+    points = get_scale(scale).points
+    grade_counts = courses['Grade'].value_counts()
+    grade_counts = grade_counts[grade_counts > 0].reset_index()
+    grade_counts.columns = ['Grade', 'Count']
+    
+    grade_order = sorted(grade_counts['Grade'], key=lambda x: points.get(x, 0), reverse=True)
+    grade_counts['Grade'] = pd.Categorical(grade_counts['Grade'].astype(object), categories=grade_order, ordered=True)
+    grade_counts = grade_counts.sort_values('Grade')
+    
+    fig = px.bar(grade_counts, x='Grade', y='Count',
+                 labels={'Count': 'Number of Courses', 'Grade': 'Grade'},
+                 color='Grade',
+                 color_discrete_sequence=px.colors.qualitative.Set1,
+                 title='Distribution of Grades')
+    
+    fig.update_layout(xaxis={'categoryorder': 'array', 'categoryarray': grade_order},
+                     plot_bgcolor='rgba(0,0,0,0)')
+    return fig
+
+
+@timed()
+@memoize('course_performance_table', columns=['Semester', 'Course Code', 'Course Name', 'Credits', 'Grade'],
+         **SHARED_FIGURE_CACHE)
+def course_performance_table(courses, scale=None):
+    """Courses ranked by their credit-weighted grade points."""
+    course_df = courses[['Semester', 'Course Code', 'Course Name', 'Credits', 'Grade']].assign(
+        **{'GPA Impact': courses['Credits'] * grade_points(courses['Grade'], scale)})
+    return course_df.sort_values('GPA Impact', ascending=False)
+
+
+@timed()
+@memoize('study_schedule_figure', **SHARED_FIGURE_CACHE)
+def study_schedule_figure(calendar):
+    """Stacked bars of each day's study hours per course, from `plan_study_week`'s calendar."""
+    fig = px.bar(calendar, x='Day', y='Hours', color='Course Name',
+                 category_orders={'Day': WEEK_DAYS},
+                 title='Suggested Weekly Study Schedule')
+    
+    fig.update_layout(xaxis_title='Day of Week',
+                     yaxis_title='Hours of Study',
+                     legend_title_text='Course',
+                     plot_bgcolor='rgba(0,0,0,0)')
+    return fig
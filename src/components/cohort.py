@@ -0,0 +1,162 @@
+import streamlit as st
+import pandas as pd
+from models.prediction import MIN_TRAINING_COURSES, GradePredictor
+from utils.constants import SEMESTERS
+from utils.cohort import STUDENT_COLUMN, cohort_gpa_tables
+from utils.grading import get_scale
+from utils.importer import iter_course_chunks, missing_columns
+from utils.lazy import lazy_import
+
+px = lazy_import('plotly.express')
+
+# Rows of the student table sent to the browser at once
+STUDENT_TABLE_ROWS = 500
+
+def load_cohort(uploaded_file, scale):
+    """Stream a cohort CSV through the importer and compute its GPA tables once."""
+    progress = st.progress(0.0, text="Loading cohort...")
+    chunks = []
+    rejected = 0
+
+    for courses, bad_rows, position in iter_course_chunks(uploaded_file, extra_columns=[STUDENT_COLUMN], scale=scale):
+        chunks.append(courses)
+        rejected += len(bad_rows)
+        progress.progress(min(1.0, position / max(uploaded_file.size, 1)), text="Loading cohort...")
+
+    courses = pd.concat(chunks, ignore_index=True).astype(
+        {STUDENT_COLUMN: 'category', 'Semester': 'category', 'Grade': 'category'})
+    students, semesters = cohort_gpa_tables(courses, scale=scale)
+    progress.empty()
+
+    return {
+        'file_id': uploaded_file.file_id,
+        'scale': scale.name,
+        'courses': len(courses),
+        'course_frame': courses,
+        'rejected': rejected,
+        'students': students,
+        'semesters': semesters,
+    }
+
+def render_cohort_prediction(cohort, scale):
+    """Predict one planned course for every student in the cohort in a single batch."""
+    st.markdown('<h3 class="section-header">Predict a Course for Every Student</h3>', unsafe_allow_html=True)
+    if cohort['courses'] < MIN_TRAINING_COURSES:
+        st.info(f"The cohort needs at least {MIN_TRAINING_COURSES} courses for predictions.")
+        return
+
+    with st.form("cohort_prediction_form"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            course_code = st.text_input("Course Code", placeholder="CS301", key="cohort_predict_code")
+        with col2:
+            credits = st.number_input("Credits", min_value=1, max_value=6, key="cohort_predict_credits")
+        with col3:
+            semester = st.selectbox("Semester", SEMESTERS, key="cohort_predict_semester")
+        predict_button = st.form_submit_button("Predict for all students")
+
+    if not predict_button:
+        return
+    if not course_code:
+        st.error("Please enter a course code.")
+        return
+
+    try:
+        # Trained once per loaded cohort; the cohort is reloaded when the file or scale changes
+        if 'predictor' not in cohort:
+            with st.spinner("Training on the cohort..."):
+                cohort['predictor'] = GradePredictor(scale, group_column=STUDENT_COLUMN).fit(cohort['course_frame'])
+        students = cohort['students'].index
+        predictions = cohort['predictor'].predict(pd.DataFrame({
+            STUDENT_COLUMN: students,
+            'Course Code': course_code,
+            'Credits': credits,
+            'Semester': semester,
+        }, index=students))
+    except Exception as e:
+        st.error(f"Error predicting grades: {e}")
+        return
+
+    grade_counts = predictions['Predicted Grade'].value_counts().reindex(scale.grades, fill_value=0)
+    fig = px.bar(x=grade_counts.index, y=grade_counts.to_numpy(), labels={'x': 'Predicted Grade', 'y': 'Students'},
+                 title=f'Predicted Grades in {course_code}')
+    fig.update_layout(plot_bgcolor='rgba(0,0,0,0)')
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.write("Students with the lowest predicted results")
+    st.dataframe(predictions.nsmallest(STUDENT_TABLE_ROWS, 'Predicted Points'), use_container_width=True,
+                 column_config={
+                     "Predicted Points": st.column_config.NumberColumn("Predicted Points", format="%.2f"),
+                     "Prior GPA": st.column_config.NumberColumn("Prior GPA", format="%.2f"),
+                     "Subject Average": st.column_config.NumberColumn("Subject Average", format="%.2f"),
+                 })
+
+def render_cohort_dashboard():
+    """Render GPA summaries for a whole cohort of students."""
+    st.markdown('<h2 class="section-header">Cohort Dashboard</h2>', unsafe_allow_html=True)
+    st.write(f"Upload one CSV with every student's courses and a '{STUDENT_COLUMN}' column")
+
+    uploaded_file = st.file_uploader("Upload a cohort CSV", type="csv", key="upload_cohort")
+    scale = get_scale(st.session_state.get("grading_scale"))
+    cohort = st.session_state.get('cohort')
+    if uploaded_file is None:
+        # The uploader forgets its file when another view is shown; keep showing the cohort loaded before
+        if cohort is None:
+            st.info("Upload a cohort file to see per-student GPAs.")
+            return
+        if cohort['scale'] != scale.name:
+            st.info(f"Showing the last loaded cohort graded on the {get_scale(cohort['scale']).label} scale. "
+                    "Upload the file again to regrade it.")
+            scale = get_scale(cohort['scale'])
+    elif cohort is None or cohort['file_id'] != uploaded_file.file_id or cohort['scale'] != scale.name:
+        try:
+            missing = missing_columns(uploaded_file, extra_columns=[STUDENT_COLUMN])
+            if missing:
+                st.error(f"The uploaded CSV does not have the required columns: {', '.join(missing)}")
+                return
+            cohort = st.session_state.cohort = load_cohort(uploaded_file, scale)
+        except Exception as e:
+            st.error(f"Error loading cohort: {e}")
+            return
+
+    students = cohort['students']
+    if cohort['rejected']:
+        st.warning(f"Skipped {cohort['rejected']} rows that failed validation.")
+    if students.empty:
+        st.info("The cohort file has no valid courses.")
+        return
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Students", f"{len(students):,}")
+    col2.metric("Courses", f"{cohort['courses']:,}")
+    col3.metric("Mean GPA", f"{students['GPA'].mean():.2f}")
+    col4.metric("Median GPA", f"{students['GPA'].median():.2f}")
+
+    fig = px.histogram(students, x='GPA', nbins=40, range_x=[0, scale.max_points], title='Cumulative GPA Distribution')
+    fig.update_layout(yaxis_title='Students', plot_bgcolor='rgba(0,0,0,0)')
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Student ranking, trimmed before it reaches the browser
+    st.markdown('<h3 class="section-header">Students</h3>', unsafe_allow_html=True)
+    ascending = st.toggle("Lowest GPA first", key="cohort_ascending")
+    ranked = students.sort_values('GPA', ascending=ascending).head(STUDENT_TABLE_ROWS)
+    st.dataframe(ranked, use_container_width=True,
+                 column_config={
+                     "GPA": st.column_config.NumberColumn("GPA", format="%.2f"),
+                     "Weighted Points": None,
+                 })
+
+    # Drill down into one student's semesters
+    student = st.text_input(f"Look up a {STUDENT_COLUMN}", key="cohort_student")
+    if student:
+        if student not in students.index:
+            st.error(f"No student with {STUDENT_COLUMN} {student}.")
+        else:
+            st.dataframe(cohort['semesters'].loc[student], use_container_width=True,
+                         column_config={
+                             "GPA": st.column_config.NumberColumn("GPA", format="%.2f"),
+                             "Cumulative GPA": st.column_config.NumberColumn("Cumulative GPA", format="%.2f"),
+                             "Weighted Points": None,
+                         })
+
+    render_cohort_prediction(cohort, scale)
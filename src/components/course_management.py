@@ -1,102 +1,249 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
-from datetime import datetime
-from utils.helpers import add_course, delete_course
-from utils.constants import GRADE_POINTS
+from utils import MAX_CREDITS, MIN_CREDITS
+from utils.constants import SEMESTERS
+from utils.cache import LRUCache
+from utils.exporter import EXPORT_FORMATS, export_courses
+from utils.grading import get_scale
+from utils.helpers import grade_points, semester_sort_key
+from utils.importer import iter_course_chunks, missing_columns
+
+PAGE_SIZES = [25, 50, 100]
+SORT_COLUMNS = ['Timestamp', 'Semester', 'Course Code', 'Course Name', 'Credits', 'Grade']
+EDITABLE_COLUMNS = ['Semester', 'Course Code', 'Course Name', 'Credits', 'Grade']
+REJECTED_SAMPLE_ROWS = 20
+# Prepared export files kept per session; they can be large, so only a couple
+EXPORT_CACHE_SIZE = 2
+
+def save_courses_data(store):
+    """Append pending course changes to the on-disk log."""
+    try:
+        course_log = st.session_state.course_log
+        course_log.append(store)
+        # Fold the log back into a single snapshot once enough changes pile up
+        if course_log.needs_compaction:
+            course_log.compact(store)
+        return True
+    except Exception as e:
+        st.error(f"Error saving data: {e}")
+        return False
+
+def filter_and_sort_courses(courses, search="", semesters=(), grades=(), sort_by='Timestamp', ascending=True,
+                            scale=None):
+    """Return the positions of matching courses in display order."""
+    mask = np.ones(len(courses), dtype=bool)
+
+    if search:
+        needle = search.lower()
+        mask &= (courses['Course Code'].astype(str).str.lower().str.contains(needle, regex=False).to_numpy()
+                 | courses['Course Name'].astype(str).str.lower().str.contains(needle, regex=False).to_numpy())
+    if semesters:
+        mask &= courses['Semester'].isin(semesters).to_numpy()
+    if grades:
+        mask &= courses['Grade'].isin(grades).to_numpy()
+
+    positions = np.flatnonzero(mask)
+    sort_keys = courses[sort_by].iloc[positions]
+    if sort_by == 'Grade':
+        sort_keys = grade_points(sort_keys, scale)
+    elif isinstance(sort_keys.dtype, pd.CategoricalDtype):
+        sort_keys = sort_keys.astype(object)
+    order = np.argsort(sort_keys.to_numpy(), kind='stable')
+    if not ascending:
+        order = order[::-1]
+    return positions[order]
+
+def render_course_grid(store):
+    """Render one page of the filtered course list as an editable grid."""
+    courses = store.frame()
+    scale = get_scale(st.session_state.get("grading_scale"))
+
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        search = st.text_input("Search by code or name", key="courses_search")
+    with col2:
+        semesters = st.multiselect("Semesters", sorted(courses['Semester'].unique(), key=semester_sort_key),
+                                   key="courses_semesters")
+    with col3:
+        grades = st.multiselect("Grades", scale.grades, key="courses_grades")
+
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        sort_by = st.selectbox("Sort by", SORT_COLUMNS, key="courses_sort_by")
+    with col2:
+        ascending = st.toggle("Ascending", key="courses_ascending")
+    with col3:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, key="courses_page_size")
+
+    positions = filter_and_sort_courses(courses, search, semesters, grades, sort_by, ascending, scale)
+    page_count = max(1, -(-len(positions) // page_size))
+    if st.session_state.get("course_grid_page", 1) > page_count:
+        st.session_state.course_grid_page = page_count
+    page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, key="course_grid_page")
+
+    # Only the visible page is materialised and sent to the browser
+    page_positions = positions[(page - 1) * page_size:page * page_size]
+    page_df = courses.iloc[page_positions][EDITABLE_COLUMNS].astype({'Semester': object, 'Grade': object})
+    page_df.insert(0, 'Select', False)
+
+    # Imported labels such as 'Semester 10.1' must stay selectable on their own rows
+    semester_options = sorted(set(SEMESTERS).union(courses['Semester'].unique()), key=semester_sort_key)
+    edited = st.data_editor(
+        page_df,
+        key=f"course_grid_{store.version}_{page}",
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "Select": st.column_config.CheckboxColumn("Select", help="Mark courses for deletion"),
+            "Semester": st.column_config.SelectboxColumn("Semester", options=semester_options, required=True),
+            "Credits": st.column_config.NumberColumn("Credits", min_value=MIN_CREDITS, max_value=MAX_CREDITS, step=1,
+                                                     required=True),
+            "Grade": st.column_config.SelectboxColumn("Grade", options=scale.grades, required=True),
+        },
+    )
+    st.caption(f"Showing {len(page_positions)} of {len(positions)} matching courses ({len(courses)} total)")
+
+    selected = page_positions[edited['Select'].to_numpy(dtype=bool)]
+    changed = (edited[EDITABLE_COLUMNS] != page_df[EDITABLE_COLUMNS]).any(axis=1).to_numpy()
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("Save changes", disabled=not changed.any()):
+            store.update_courses(page_positions[changed], edited.loc[changed, EDITABLE_COLUMNS])
+            if save_courses_data(store):
+                st.success(f"Updated {int(changed.sum())} courses.")
+                st.rerun()
+            else:
+                st.error("Courses updated but failed to save data.")
+    with col2:
+        if st.button(f"Delete selected ({len(selected)})", disabled=len(selected) == 0):
+            store.delete_courses(selected)
+            if save_courses_data(store):
+                st.success(f"Deleted {len(selected)} courses.")
+                st.rerun()
+            else:
+                st.error("Courses deleted but failed to save data.")
+
+def render_export(store):
+    """Build an export only when asked for, reusing it until the courses change."""
+    if 'export_cache' not in st.session_state:
+        st.session_state.export_cache = LRUCache(maxsize=EXPORT_CACHE_SIZE)
+    export_cache = st.session_state.export_cache
+
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        fmt = st.selectbox("Export format", list(EXPORT_FORMATS), key="courses_export_format")
+    extension, mime = EXPORT_FORMATS[fmt]
+    key = (fmt, id(store), store.version)
+
+    with col2:
+        if key in export_cache:
+            st.download_button(
+                label=f"Download Course Data ({fmt})",
+                data=export_cache.get(key),
+                file_name=f"my_courses.{extension}",
+                mime=mime,
+            )
+        elif st.button(f"Prepare {fmt} export"):
+            try:
+                export_cache.get_or_create(key, lambda: export_courses(store.frame(), fmt))
+                st.rerun()
+            except ImportError:
+                st.error(f"{fmt} export needs pyarrow. Please install it using: pip install pyarrow")
+
+def render_import(store, scale):
+    """Render the CSV import widget and stream a confirmed upload into the store."""
+    summary = st.session_state.pop('import_summary', None)
+    if summary is not None:
+        imported, rejected, rejected_sample = summary
+        st.success(f"Imported {imported} courses.")
+        if rejected:
+            st.warning(f"Skipped {rejected} rows that failed validation. First few:")
+            st.dataframe(rejected_sample, use_container_width=True, hide_index=True)
+
+    uploaded_file = st.file_uploader("Upload a CSV file with your courses", type="csv")
+
+    if uploaded_file is not None:
+        try:
+            missing = missing_columns(uploaded_file)
+            if missing:
+                st.error(f"The uploaded CSV does not have the required columns: {', '.join(missing)}")
+                return
+
+            if st.button("Confirm Import"):
+                progress = st.progress(0.0, text="Importing courses...")
+                imported = rejected = 0
+                rejected_samples = []
+
+                # Append chunk by chunk so only one chunk is ever held in parser memory
+                for courses, bad_rows, position in iter_course_chunks(uploaded_file, scale=scale):
+                    store.add_courses(courses)
+                    if not save_courses_data(store):
+                        st.error("Courses imported but failed to save data.")
+                        return
+                    imported += len(courses)
+                    rejected += len(bad_rows)
+                    if sum(map(len, rejected_samples)) < REJECTED_SAMPLE_ROWS:
+                        rejected_samples.append(bad_rows.head(REJECTED_SAMPLE_ROWS))
+                    progress.progress(min(1.0, position / max(uploaded_file.size, 1)),
+                                      text=f"Imported {imported} courses...")
+
+                rejected_sample = pd.concat(rejected_samples).head(REJECTED_SAMPLE_ROWS) if rejected_samples else None
+                st.session_state.import_summary = (imported, rejected, rejected_sample)
+                st.rerun()
+        except Exception as e:
+            st.error(f"Error importing courses: {e}")
 
 def render_manage_courses():
     """Render the manage courses tab."""
     st.markdown('<h2 class="section-header">Manage Your Courses</h2>', unsafe_allow_html=True)
-    
+    store = st.session_state.course_store
+    scale = get_scale(st.session_state.get("grading_scale"))
+
     # Form to add new courses
     with st.form("add_course_form"):
         st.markdown("Add a New Course")
         col1, col2 = st.columns(2)
-        
+
         with col1:
             semester = st.selectbox(
                 "Semester",
-                options=[
-                    "Semester 1.1", "Semester 1.2",
-                    "Semester 2.1", "Semester 2.2",
-                    "Semester 3.1", "Semester 3.2",
-                    "Semester 4.1", "Semester 4.2",
-                    "Semester 5.1", "Semester 5.2",
-                    "Semester 6.1", "Semester 6.2"
-                ],
+                options=SEMESTERS,
                 help="Select the semester for this course"
             )
             course_name = st.text_input("Course Name", placeholder="Introduction to Computer Science")
-            grade = st.selectbox("Grade", list(GRADE_POINTS.keys()))
-        
+            grade = st.selectbox("Grade", scale.grades)
+
         with col2:
             course_code = st.text_input("Course Code", placeholder="CS101")
-            credits = st.number_input("Credits", min_value=1, max_value=6, value=3)
-        
+            credits = st.number_input("Credits", min_value=MIN_CREDITS, max_value=MAX_CREDITS, value=3)
+
         submit_button = st.form_submit_button("Add Course")
-        
+
         if submit_button:
             if semester and course_code and course_name:
-                st.session_state.courses = add_course(st.session_state.courses, semester, course_code, course_name, credits, grade)
-                st.success(f"Added {course_name} to your courses!")
+                store.add_course(semester, course_code, course_name, credits, grade)
+                if save_courses_data(store):
+                    st.success(f"Added {course_name} to your courses!")
+                else:
+                    st.error("Course added but failed to save data.")
             else:
                 st.error("Please fill in all required fields.")
-    
+
     # Display and edit existing courses
     st.markdown("<br>", unsafe_allow_html=True)
     st.markdown("<b>Your Courses</b>", unsafe_allow_html=True)
-    
-    if st.session_state.courses.empty:
+
+    if store.empty:
         st.info("No courses added yet. Use the form above to add your first course.")
     else:
-        for index, row in st.session_state.courses.iterrows():
-            col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
-            
-            with col1:
-                st.write(f"**{row['Course Code']}**: {row['Course Name']}")
-            
-            with col2:
-                st.write(f"Semester: {row['Semester']}")
-            
-            with col3:
-                st.write(f"Credits: {row['Credits']}")
-                st.write(f"Grade: {row['Grade']}")
-            
-            with col4:
-                if st.button("Delete", key=f"delete_{index}"):
-                    st.session_state.courses = delete_course(st.session_state.courses, index)
-                    st.success("Course deleted successfully!")
-                    st.rerun()
-            
-            st.markdown("---")
-        
+        render_course_grid(store)
+
         # Export functionality
-        st.download_button(
-            label="Export Course Data (CSV)",
-            data=st.session_state.courses.to_csv(index=False).encode('utf-8'),
-            file_name="my_courses.csv",
-            mime="text/csv",
-        )
-        
-        # Import functionality
-        st.markdown("<br>", unsafe_allow_html=True)
-        st.markdown("<b>Import Courses</b>", unsafe_allow_html=True)
-        uploaded_file = st.file_uploader("Upload a CSV file with your courses", type="csv")
-        
-        if uploaded_file is not None:
-            try:
-                imported_courses = pd.read_csv(uploaded_file)
-                required_columns = ['Semester', 'Course Code', 'Course Name', 'Credits', 'Grade']
-                
-                if all(col in imported_courses.columns for col in required_columns):
-                    if st.button("Confirm Import"):
-                        if 'Timestamp' not in imported_courses.columns:
-                            imported_courses['Timestamp'] = datetime.now()
-                        
-                        st.session_state.courses = pd.concat([st.session_state.courses, imported_courses], ignore_index=True)
-                        st.success("Courses imported successfully!")
-                        st.rerun()
-                else:
-                    st.error("The uploaded CSV does not have the required columns.")
-            except Exception as e:
-                st.error(f"Error importing courses: {e}") 
\ No newline at end of file
+        render_export(store)
+
+    # Import functionality
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown("<b>Import Courses</b>", unsafe_allow_html=True)
+    render_import(store, scale)
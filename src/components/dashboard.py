@@ -1,34 +1,83 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-from utils.helpers import calculate_gpa
-from utils.constants import GRADE_POINTS
-from PIL import Image
-import base64
+from utils.cache import LRUCache
+from utils.figures import FIGURE_FORMATS, get_renderer
+from utils.grading import get_scale
+from styles.assets import image_data_uri, inject_css
+from components.charts import gpa_trend_figure, grade_distribution_figure, course_performance_table
 
-def get_base64_of_bin_file(bin_file):
-    with open(bin_file, 'rb') as f:
-        data = f.read()
-    return base64.b64encode(data).decode()
+# Charts kept per session: room for every dashboard chart across the last few data versions
+FIGURE_CACHE_SIZE = 12
+# Rendered chart image sets kept per session; the renderer's disk cache backs them up
+CHART_IMAGE_CACHE_SIZE = 3
+# Dashboard charts offered as static images: cache name -> (label, figure builder)
+EXPORTABLE_CHARTS = {
+    'gpa_trend': ('GPA Trend', gpa_trend_figure),
+    'grade_distribution': ('Grade Distribution', grade_distribution_figure),
+}
+# Background stylesheet; the image is inlined as a data URI
+BACKGROUND_CSS = """
+.stApp {
+    background-image: url("%s");
+    background-size: cover;
+    background-position: center;
+    background-repeat: no-repeat;
+    background-attachment: fixed;
+}
+"""
 
-def set_background(png_file):
-    bin_str = get_base64_of_bin_file(png_file)
-    page_bg_img = '''
-    <style>
-    .stApp {
-        background-image: url("data:image/png;base64,%s");
-        background-size: cover;
-        background-position: center;
-        background-repeat: no-repeat;
-        background-attachment: fixed;
-    }
-    </style>
-    ''' % bin_str
-    st.markdown(page_bg_img, unsafe_allow_html=True)
+def set_background(image_file):
+    """Use an image file as the app background."""
+    inject_css(BACKGROUND_CSS % image_data_uri(image_file))
+
+def cached_chart(store, scale, name, build):
+    """Build a chart from the store's courses once per data version and grading scale."""
+    if 'figure_cache' not in st.session_state:
+        st.session_state.figure_cache = LRUCache(maxsize=FIGURE_CACHE_SIZE)
+    key = (name, id(store), store.version, scale.name)
+    return st.session_state.figure_cache.get_or_create(key, lambda: build(store.frame(), scale))
+
+def render_chart_downloads(store, scale):
+    """Offer the dashboard charts as static images, rendered only when asked for."""
+    if 'chart_image_cache' not in st.session_state:
+        st.session_state.chart_image_cache = LRUCache(maxsize=CHART_IMAGE_CACHE_SIZE)
+    image_cache = st.session_state.chart_image_cache
+    
+    fmt = st.selectbox("Chart format", list(FIGURE_FORMATS), key="dashboard_chart_format")
+    extension, mime = FIGURE_FORMATS[fmt]
+    key = (fmt, id(store), store.version, scale.name)
+    
+    if key in image_cache:
+        images = image_cache.get(key)
+        columns = st.columns(len(images))
+        for column, (name, data) in zip(columns, images.items()):
+            with column:
+                st.download_button(
+                    label=f"Download {EXPORTABLE_CHARTS[name][0]} ({fmt})",
+                    data=data,
+                    file_name=f"{name}.{extension}",
+                    mime=mime,
+                )
+    elif st.button(f"Prepare {fmt} charts"):
+        def render_images():
+            images = {}
+            for name, (_, build) in EXPORTABLE_CHARTS.items():
+                fig = cached_chart(store, scale, name, build)
+                if fig is not None:
+                    images[name] = get_renderer().render(fig, fmt)
+            return images
+        
+        try:
+            with st.spinner("Rendering charts..."):
+                image_cache.get_or_create(key, render_images)
+            st.rerun()
+        except ImportError:
+            st.error("Chart export needs kaleido. Please install it using: pip install kaleido")
+        except Exception as e:
+            st.error(f"Error rendering charts: {e}")
 
 def render_dashboard():
-    courses = st.session_state.get("courses", pd.DataFrame())
-    if courses is None or not isinstance(courses, pd.DataFrame) or courses.empty:
+    store = st.session_state.get("course_store")
+    if store is None or store.empty:
         st.info("Add some courses to see your academic dashboard!")
         return
     
@@ -40,8 +89,10 @@ def render_dashboard():
         </div>
     """, unsafe_allow_html=True)
     
-    # Calculate overall GPA
-    overall_gpa = calculate_gpa(courses)
+    # Headline metrics come from the running aggregate rather than a full scan
+    scale = get_scale(st.session_state.get("grading_scale"))
+    aggregate = store.aggregate
+    overall_gpa = aggregate.gpa(scale)
     
     # Display key metrics with icons
     col1, col2, col3 = st.columns(3)
@@ -55,7 +106,7 @@ def render_dashboard():
         """.format(overall_gpa), unsafe_allow_html=True)
     
     with col2:
-        total_credits = courses['Credits'].sum()
+        total_credits = aggregate.total_credits
         st.markdown("""
             <div style='text-align: center; padding: 20px; background-color: #ffffff; border-radius: 10px; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);'>
                 <h3 style='color: #1f77b4;'>📚 Total Credits</h3>
@@ -64,7 +115,7 @@ def render_dashboard():
         """.format(total_credits), unsafe_allow_html=True)
     
     with col3:
-        total_courses = len(courses)
+        total_courses = aggregate.course_count
         st.markdown("""
             <div style='text-align: center; padding: 20px; background-color: #ffffff; border-radius: 10px; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);'>
                 <h3 style='color: #1f77b4;'>📝 Total Courses</h3>
@@ -77,56 +128,22 @@ def render_dashboard():
     # GPA Trend Chart
     st.markdown('<h3 class="section-header">GPA Trend</h3>', unsafe_allow_html=True)
     
-    semester_groups = courses.groupby('Semester')
-    semester_gpas = []
-    
-    for sem, group in semester_groups:
-        sem_gpa = calculate_gpa(group)
-        semester_gpas.append({'Semester': sem, 'GPA': sem_gpa})
-    
-    semester_gpa_df = pd.DataFrame(semester_gpas)
-    
-    if not semester_gpa_df.empty:
-        fig = px.line(semester_gpa_df, x='Semester', y='GPA', 
-                      markers=True, line_shape='linear',
-                      labels={'GPA': 'GPA', 'Semester': 'Semester'},
-                      title='GPA Trend by Semester')
-        
-        fig.update_layout(xaxis_title='Semester',
-                         yaxis_title='GPA',
-                         yaxis_range=[0, 4.0],
-                         plot_bgcolor='rgba(0,0,0,0)')
-        
+    fig = cached_chart(store, scale, 'gpa_trend', gpa_trend_figure)
+    if fig is not None:
         st.plotly_chart(fig, use_container_width=True)
     
     # Grade Distribution
     st.markdown('<h3 class="section-header">Grade Distribution</h3>', unsafe_allow_html=True)
     
-    grade_counts = courses['Grade'].value_counts().reset_index()
-    grade_counts.columns = ['Grade', 'Count']
-    
-    grade_order = sorted(grade_counts['Grade'], key=lambda x: GRADE_POINTS.get(x, 0), reverse=True)
-    grade_counts['Grade'] = pd.Categorical(grade_counts['Grade'], categories=grade_order, ordered=True)
-    grade_counts = grade_counts.sort_values('Grade')
-    
-    fig = px.bar(grade_counts, x='Grade', y='Count',
-                 labels={'Count': 'Number of Courses', 'Grade': 'Grade'},
-                 color='Grade',
-                 color_discrete_sequence=px.colors.qualitative.Set1,
-                 title='Distribution of Grades')
-    
-    fig.update_layout(xaxis={'categoryorder': 'array', 'categoryarray': grade_order},
-                     plot_bgcolor='rgba(0,0,0,0)')
-    
+    fig = cached_chart(store, scale, 'grade_distribution', grade_distribution_figure)
     st.plotly_chart(fig, use_container_width=True)
     
     # Course Performance Table
     st.markdown('<h3 class="section-header">Course Performance</h3>', unsafe_allow_html=True)
     
-    course_df = courses[['Semester', 'Course Code', 'Course Name', 'Credits', 'Grade']]
-    course_df['GPA Impact'] = course_df['Credits'] * course_df['Grade'].map(GRADE_POINTS)
+    course_df = cached_chart(store, scale, 'course_performance', course_performance_table)
     
-    st.dataframe(course_df.sort_values('GPA Impact', ascending=False), use_container_width=True,
+    st.dataframe(course_df, use_container_width=True,
                 column_config={
                     "GPA Impact": st.column_config.NumberColumn(
                         "GPA Impact",
@@ -134,4 +151,8 @@ def render_dashboard():
                         format="%.2f",
                     ),
         
-         })
\ No newline at end of file
+         })
+    
+    # Static chart export
+    st.markdown('<h3 class="section-header">Export Charts</h3>', unsafe_allow_html=True)
+    render_chart_downloads(store, scale)
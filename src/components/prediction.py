@@ -0,0 +1,63 @@
+import streamlit as st
+import pandas as pd
+from models.prediction import MIN_TRAINING_COURSES, GradePredictor
+from utils.constants import SEMESTERS
+from utils.grading import get_scale
+
+def get_predictor(store, scale):
+    """Return the session's grade predictor, trained up to the store's current version."""
+    predictor = st.session_state.get('grade_predictor')
+    if predictor is None or predictor.scale is not scale:
+        predictor = st.session_state.grade_predictor = GradePredictor(scale)
+    # Cached per data version; appended courses are learned incrementally
+    return predictor.sync(store)
+
+def render_grade_prediction():
+    """Render the grade prediction tab."""
+    st.markdown('<h2 class="section-header">Grade Prediction</h2>', unsafe_allow_html=True)
+    st.write("Predict grades for upcoming courses from your results so far")
+    
+    store = st.session_state.course_store
+    if len(store) < MIN_TRAINING_COURSES:
+        st.info(f"Add at least {MIN_TRAINING_COURSES} courses to get grade predictions.")
+        return
+    
+    scale = get_scale(st.session_state.get("grading_scale"))
+    try:
+        predictor = get_predictor(store, scale)
+    except Exception as e:
+        st.error(f"Error training the prediction model: {e}")
+        return
+    
+    with st.form("grade_prediction_form"):
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            course_code = st.text_input("Course Code", placeholder="CS301", key="predict_course_code")
+        
+        with col2:
+            credits = st.number_input("Credits", min_value=1, max_value=6, key="predict_credits")
+        
+        with col3:
+            semester = st.selectbox("Semester", SEMESTERS, key="predict_semester")
+        
+        predict_button = st.form_submit_button("Predict Grade", type="primary")
+    
+    if predict_button:
+        if not course_code:
+            st.error("Please enter a course code.")
+            return
+        
+        prediction = predictor.predict(pd.DataFrame({
+            'Course Code': [course_code],
+            'Credits': [credits],
+            'Semester': [semester],
+        })).iloc[0]
+        
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Predicted Grade", prediction['Predicted Grade'])
+        col2.metric("Predicted Points", f"{prediction['Predicted Points']:.2f}")
+        col3.metric("Subject Average", f"{prediction['Subject Average']:.2f}",
+                    delta=f"{prediction['Subject Average'] - prediction['Prior GPA']:+.2f} vs GPA")
+        st.caption("Based on your GPA and subject average in semesters before the one selected. "
+                   "Subjects are taken from the course code's letter prefix.")
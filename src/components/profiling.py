@@ -0,0 +1,46 @@
+import streamlit as st
+import pandas as pd
+from utils import profiling
+from utils.cache import cache_stats
+from utils.memory import session_memory_report
+
+def render_profile_panel(store_bytes_before, store_bytes_after):
+    """Show this rerun's timing spans and the course store's memory in the sidebar."""
+    with st.sidebar.expander("Profiling", expanded=False):
+        spans = profiling.current_run()
+        if spans:
+            st.dataframe(pd.DataFrame({
+                'Span': [' ' * depth + name for name, depth, _ in spans],
+                'ms': [seconds * 1000 for _, _, seconds in spans],
+            }), hide_index=True, use_container_width=True,
+                column_config={"ms": st.column_config.NumberColumn("ms", format="%.2f")})
+
+        delta = store_bytes_after - store_bytes_before
+        st.metric("Course store", f"{store_bytes_after / 1024:,.1f} KiB", f"{delta / 1024:+,.1f} KiB",
+                  delta_color="off")
+
+        totals = profiling.span_totals()
+        if totals:
+            st.write("Since the server started")
+            st.dataframe(pd.DataFrame(
+                [(name, count, total / count * 1000, longest * 1000) for name, (count, total, longest) in totals.items()],
+                columns=['Span', 'Calls', 'Mean ms', 'Max ms'],
+            ).sort_values('Mean ms', ascending=False), hide_index=True, use_container_width=True,
+                column_config={
+                    "Mean ms": st.column_config.NumberColumn("Mean ms", format="%.2f"),
+                    "Max ms": st.column_config.NumberColumn("Max ms", format="%.2f"),
+                })
+
+        caches = cache_stats()
+        if caches:
+            st.write("Shared caches")
+            st.dataframe(pd.DataFrame.from_dict(caches, orient='index').rename_axis('Cache').reset_index(),
+                         hide_index=True, use_container_width=True)
+
+        # Walking every object is O(session size), so it only runs when asked for
+        if st.button("Measure session memory", key="profile_measure_memory"):
+            report = session_memory_report(st.session_state)
+            st.metric("Session total", f"{report['Bytes'].sum() / 1024:,.1f} KiB")
+            st.dataframe(report.assign(KiB=report['Bytes'] / 1024).drop(columns='Bytes'), hide_index=True,
+                         use_container_width=True,
+                         column_config={"KiB": st.column_config.NumberColumn("KiB", format="%.1f")})
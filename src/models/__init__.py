@@ -0,0 +1,3 @@
+"""
+Predictive models for the GPA Insight application
+"""
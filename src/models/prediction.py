@@ -0,0 +1,269 @@
+"""
+Grade prediction for the GPA Insight application
+
+A course's grade is predicted from its credits and level, and from the
+student's record in every earlier semester: the credit-weighted average
+overall and in the same subject. Subjects are the letter prefix of the course
+code ('CS' for 'CS101') and the level is the first digit after it.
+
+The regressor and feature scaler both support `partial_fit`, so courses
+appended after the first fit only cost a pass over the new rows.
+"""
+
+import re
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from utils.grading import get_scale
+from utils.lazy import lazy_import
+
+# scikit-learn takes about a second to import; load it only when a model is fitted
+sklearn_exceptions = lazy_import('sklearn.exceptions')
+linear_model = lazy_import('sklearn.linear_model')
+preprocessing = lazy_import('sklearn.preprocessing')
+
+# Fewer courses than this give the regressor nothing meaningful to learn from
+MIN_TRAINING_COURSES = 5
+
+# A full refit runs about this many sample updates, within the epoch bounds below;
+# small transcripts need many epochs to converge, large ones a handful.
+# Later appends are single partial_fit passes.
+FIT_SAMPLE_UPDATES = 1_000_000
+MIN_FIT_EPOCHS = 5
+MAX_FIT_EPOCHS = 1000
+
+FEATURE_COLUMNS = ['Credits', 'Level', 'Prior GPA', 'Has Prior', 'Subject Average', 'Subject Courses']
+
+# Semester positions are year * 10 + term, far below this; history keys pack a position under it
+_POSITION_SPAN = 1 << 20
+
+_SEMESTER_PATTERN = re.compile(r'(\d+)\D+(\d+)')
+_CODE_PATTERN = re.compile(r'^\s*([A-Za-z]*)\s*(\d?)')
+
+
+def _per_label(labels, parse, missing):
+    """Apply `parse` to each distinct label once and broadcast it; missing labels get `missing`."""
+    codes, uniques = pd.factorize(labels)
+    # Code -1 (missing label) picks the appended fallback
+    return np.array([parse(str(label)) for label in uniques] + [missing])[codes]
+
+
+def _semester_position(label):
+    match = _SEMESTER_PATTERN.search(label)
+    return int(match.group(1)) * 10 + int(match.group(2)) if match else 0
+
+
+def semester_positions(semesters):
+    """Chronological position of each semester label: 'Semester 2.1' -> 21, unrecognised -> 0."""
+    return np.clip(_per_label(semesters, _semester_position, 0).astype(np.int64), 0, _POSITION_SPAN - 1)
+
+
+def course_subjects(codes):
+    """Letter prefix of each course code, upper-cased; 'GEN' when there is none."""
+    return _per_label(codes, lambda code: _CODE_PATTERN.match(code).group(1).upper() or 'GEN', 'GEN').astype(object)
+
+
+def course_levels(codes):
+    """First digit after a course code's letter prefix ('CS204' -> 2), 0 when there is none."""
+    return _per_label(codes, lambda code: int(_CODE_PATTERN.match(code).group(2) or 0), 0).astype(np.int64)
+
+
+def _course_keys(courses_df, group_column):
+    """Student, semester position, subject, level and credits of each course."""
+    groups = courses_df[group_column].astype(str).to_numpy(dtype=object) if group_column \
+        else np.zeros(len(courses_df), dtype=object)
+    return {
+        'Group': groups,
+        'Position': semester_positions(courses_df['Semester']),
+        'Subject': course_subjects(courses_df['Course Code']),
+        'Level': course_levels(courses_df['Course Code']),
+        'Credits': courses_df['Credits'].to_numpy(dtype=float),
+    }
+
+
+def _course_table(courses_df, group_column, scale):
+    """Course keys plus the grade as a fraction of the scale maximum, the training target."""
+    table = _course_keys(courses_df, group_column)
+    table['Fraction'] = scale.grade_points(courses_df['Grade']).fillna(0.0).to_numpy() / scale.max_points
+    return table
+
+
+class _RunningTotals:
+    """Running sums per key prefix, looked up as of a position with a binary search.
+
+    Keys are ``prefix * _POSITION_SPAN + position``; the totals at a key cover
+    every earlier-or-equal position with the same prefix.
+    """
+
+    def __init__(self, prefixes, positions, values):
+        keys = prefixes * _POSITION_SPAN + positions
+        order = np.argsort(keys, kind='stable')
+        self.keys, starts = np.unique(keys[order], return_index=True)
+        sums = np.add.reduceat(values[order], starts, axis=0) if len(starts) else values[:0]
+
+        # Cumulative sums restarted at every new prefix
+        running = np.cumsum(sums, axis=0)
+        key_prefixes = self.keys // _POSITION_SPAN
+        first = np.flatnonzero(np.diff(key_prefixes, prepend=key_prefixes[:1] - 1))
+        before = np.vstack([np.zeros((1, values.shape[1])), running])[first]
+        self.running = running - np.repeat(before, np.diff(np.r_[first, len(self.keys)]), axis=0)
+
+    def before(self, prefixes, positions):
+        """Totals over positions strictly before `positions`; zeros for unknown (negative) prefixes."""
+        keys = prefixes * _POSITION_SPAN + positions
+        index = np.searchsorted(self.keys, keys, side='left') - 1
+        found = (prefixes >= 0) & (index >= 0)
+        found[found] = self.keys[index[found]] // _POSITION_SPAN == prefixes[found]
+        totals = np.zeros((len(keys), self.running.shape[1]))
+        totals[found] = self.running[index[found]]
+        return totals
+
+
+class CourseHistory:
+    """Running credit and grade totals per student, and per student and subject.
+
+    `features()` looks up, for any course, the totals over semesters strictly
+    before its own, so training rows and new queries share one vectorised path.
+    """
+
+    def __init__(self, table):
+        # Integer codes for students and subjects; labels unseen here get -1 at query time
+        self.groups = pd.Index(pd.unique(table['Group']))
+        self.subjects = pd.Index(pd.unique(table['Subject']))
+        groups, subjects = self._codes(table)
+
+        weighted = table['Fraction'] * table['Credits']
+        credits = table['Credits'].sum()
+        self.mean_fraction = float(weighted.sum() / credits) if credits else 0.5
+
+        values = np.column_stack([table['Credits'], weighted, np.ones(len(weighted))])
+        self.overall = _RunningTotals(groups, table['Position'], values)
+        self.by_subject = _RunningTotals(groups * len(self.subjects) + subjects, table['Position'], values)
+
+    def _codes(self, table):
+        groups = self.groups.get_indexer(table['Group']).astype(np.int64)
+        subjects = self.subjects.get_indexer(table['Subject']).astype(np.int64)
+        return groups, subjects
+
+    def features(self, table):
+        """FEATURE_COLUMNS for course keys as built by _course_keys."""
+        groups, subjects = self._codes(table)
+        positions = table['Position']
+        overall = self.overall.before(groups, positions)
+        subject_prefixes = np.where((groups >= 0) & (subjects >= 0), groups * len(self.subjects) + subjects, -1)
+        subject = self.by_subject.before(subject_prefixes, positions)
+
+        has_prior = overall[:, 0] > 0
+        prior_gpa = np.where(has_prior, overall[:, 1] / np.where(has_prior, overall[:, 0], 1), self.mean_fraction)
+        has_subject = subject[:, 0] > 0
+        subject_average = np.where(has_subject, subject[:, 1] / np.where(has_subject, subject[:, 0], 1), prior_gpa)
+
+        return np.column_stack([
+            table['Credits'],
+            table['Level'].astype(float),
+            prior_gpa,
+            has_prior.astype(float),
+            subject_average,
+            np.log1p(subject[:, 2]),
+        ])
+
+
+class GradePredictor:
+    """Incrementally trained grade regressor, synchronised with a course store.
+
+    `group_column` names a student column for cohort data; without it every
+    course belongs to one student.
+    """
+
+    def __init__(self, scale=None, group_column=None, random_state=0):
+        self.scale = get_scale(scale)
+        self.group_column = group_column
+        self.random_state = random_state
+        self.version = None
+        self.edit_version = None
+        self.trained_rows = 0
+        self.history = None
+        self._scaler = None
+        self._model = None
+
+    @property
+    def fitted(self):
+        return self._model is not None
+
+    def fit(self, courses_df):
+        """Train from scratch on every course."""
+        self._model = None
+        self.trained_rows = 0
+        self._learn(courses_df, 0)
+        return self
+
+    def _learn(self, courses_df, start):
+        """Refresh the history and train on the courses from position `start` on."""
+        table = _course_table(courses_df, self.group_column, self.scale)
+        self.history = CourseHistory(table)
+        count = len(table['Credits'])
+        if count < MIN_TRAINING_COURSES:
+            self._model = None
+            self.trained_rows = 0
+            return
+
+        if self._model is not None:
+            table = {name: column[start:] for name, column in table.items()}
+        features = self.history.features(table)
+        targets = table['Fraction']
+
+        if self._model is None:
+            epochs = int(np.clip(FIT_SAMPLE_UPDATES // count, MIN_FIT_EPOCHS, MAX_FIT_EPOCHS))
+            self._scaler = preprocessing.StandardScaler().fit(features)
+            self._model = linear_model.SGDRegressor(alpha=1e-3, max_iter=epochs, tol=1e-4, random_state=self.random_state)
+            with warnings.catch_warnings():
+                # Large fits stop at the epoch cap on purpose
+                warnings.simplefilter('ignore', sklearn_exceptions.ConvergenceWarning)
+                self._model.fit(self._scaler.transform(features), targets)
+        elif len(targets):
+            self._scaler.partial_fit(features)
+            self._model.partial_fit(self._scaler.transform(features), targets)
+        self.trained_rows = count
+
+    def sync(self, store):
+        """Bring the model up to the store's current version.
+
+        Nothing happens when the version is unchanged. If courses were only
+        appended since the last sync, just the new rows are learned with
+        partial_fit; an update or delete triggers a full refit.
+        """
+        if self.version == store.version:
+            return self
+        courses = store.frame()
+        if self.fitted and self.edit_version == store.edit_version and len(courses) >= self.trained_rows:
+            self._learn(courses, self.trained_rows)
+        else:
+            self.fit(courses)
+        self.version = store.version
+        self.edit_version = store.edit_version
+        return self
+
+    def predict(self, queries_df):
+        """Predict points and the nearest grade for courses given by Course Code, Credits and Semester.
+
+        For cohort models `queries_df` also needs the group column; every
+        query is scored against that student's history in one batch.
+        """
+        if not self.fitted:
+            raise ValueError(f"Add at least {MIN_TRAINING_COURSES} courses to predict grades")
+
+        features = self.history.features(_course_keys(queries_df, self.group_column))
+        fractions = np.clip(self._model.predict(self._scaler.transform(features)), 0.0, 1.0)
+        points = fractions * self.scale.max_points
+
+        scale_points = np.array([self.scale.points[grade] for grade in self.scale.grades])
+        nearest = np.abs(points[:, None] - scale_points[None, :]).argmin(axis=1)
+
+        return pd.DataFrame({
+            'Predicted Points': points,
+            'Predicted Grade': np.array(self.scale.grades, dtype=object)[nearest],
+            'Prior GPA': features[:, FEATURE_COLUMNS.index('Prior GPA')] * self.scale.max_points,
+            'Subject Average': features[:, FEATURE_COLUMNS.index('Subject Average')] * self.scale.max_points,
+        }, index=queries_df.index)
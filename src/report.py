@@ -0,0 +1,217 @@
+"""
+Batch GPA reports for a directory of transcript files
+
+Every *.csv file in the input directory is a transcript in the import format.
+A file with a 'Student ID' column may hold many students; otherwise the file
+name is used as the student ID. Files are spread over a process pool in
+chunks, and the per-student tables are merged in the parent process.
+
+Usage:
+    python src/report.py TRANSCRIPTS_DIR OUTPUT_DIR [--format parquet] [--charts]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+sys.path.append(os.path.dirname(__file__))
+
+import pandas as pd
+
+from utils.cohort import STUDENT_COLUMN, cohort_gpa_tables, merge_semester_tables
+from utils.exporter import export_courses
+from utils.grading import DEFAULT_SCALE, GRADING_SCALES, get_scale
+from utils.importer import iter_course_chunks, missing_columns
+
+# Report file format -> exporter format label
+REPORT_FORMATS = {'csv': 'CSV', 'parquet': 'Parquet'}
+
+# Work handed to a worker per task; large enough to amortise pickling, small enough to balance load
+FILES_PER_TASK = 16
+STUDENTS_PER_CHART_TASK = 200
+
+
+def find_transcripts(directory):
+    """Return the transcript CSV files in a directory, sorted by name."""
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.lower().endswith('.csv') and os.path.isfile(os.path.join(directory, name))
+    )
+
+
+def iter_batches(items, size):
+    """Yield consecutive lists of at most `size` items."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def load_transcript(path, scale):
+    """Read one transcript file into validated courses and a count of rejected rows."""
+    with open(path, 'rb') as file:
+        # The student column is optional; without it the whole file is one student
+        missing = missing_columns(file, extra_columns=[STUDENT_COLUMN])
+        extra_columns = [] if STUDENT_COLUMN in missing else [STUDENT_COLUMN]
+        missing = [col for col in missing if col != STUDENT_COLUMN]
+        if missing:
+            raise ValueError(f"missing columns: {', '.join(missing)}")
+
+        chunks = []
+        rejected = 0
+        for courses, bad_rows, _ in iter_course_chunks(file, extra_columns=extra_columns, scale=scale):
+            chunks.append(courses)
+            rejected += len(bad_rows)
+
+    courses = pd.concat(chunks, ignore_index=True)
+    if not extra_columns:
+        courses[STUDENT_COLUMN] = os.path.splitext(os.path.basename(path))[0]
+    return courses, rejected
+
+
+def report_batch(paths, scale_name):
+    """Worker task: per-student semester totals for a batch of transcript files.
+
+    Returns ``(semester_tables, courses, rejected, errors)``, where `errors` is
+    a list of (path, message) for files that could not be read or have no
+    valid courses.
+    """
+    scale = get_scale(scale_name)
+    tables, errors = [], []
+    course_count = rejected_count = 0
+
+    for path in paths:
+        try:
+            courses, rejected = load_transcript(path, scale)
+        except Exception as e:
+            errors.append((path, str(e)))
+            continue
+        course_count += len(courses)
+        rejected_count += rejected
+        if courses.empty:
+            errors.append((path, "no valid courses"))
+            continue
+        tables.append(cohort_gpa_tables(courses, scale=scale)[1])
+
+    return tables, course_count, rejected_count, errors
+
+
+def _chart_file_name(student):
+    return re.sub(r'[^\w.-]', '_', str(student)) + '.png'
+
+
+def write_student_charts(semesters, chart_dir, max_points):
+    """Worker task: draw a semester and cumulative GPA chart per student as PNG."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    # One figure per task; only line data and labels change between students
+    fig, ax = plt.subplots(figsize=(8, 4))
+    fig.subplots_adjust(bottom=0.28)
+    gpa_line, = ax.plot([], [], marker='o', label='GPA')
+    cumulative_line, = ax.plot([], [], marker='o', label='Cumulative GPA')
+    ax.set_ylim(0, max_points)
+    ax.set_xlabel('Semester')
+    ax.set_ylabel('GPA')
+    ax.legend(loc='lower right')
+
+    written = 0
+    for student, table in semesters.groupby(level=0, observed=True, sort=False):
+        positions = range(len(table))
+        gpa_line.set_data(positions, table['GPA'])
+        cumulative_line.set_data(positions, table['Cumulative GPA'])
+        ax.set_xticks(positions, table.index.get_level_values(1).astype(str), rotation=45, ha='right')
+        ax.set_xlim(-0.5, len(table) - 0.5)
+        ax.set_title(f'GPA Trend for {student}')
+        fig.savefig(os.path.join(chart_dir, _chart_file_name(student)))
+        written += 1
+    plt.close(fig)
+    return written
+
+
+def _write_report(table, path, fmt):
+    with open(path, 'wb') as file:
+        file.write(export_courses(table.reset_index(), REPORT_FORMATS[fmt]))
+
+
+def generate_reports(paths, output_dir, fmt='csv', scale=DEFAULT_SCALE, charts=False, workers=None,
+                     files_per_task=FILES_PER_TASK, log=print):
+    """Build students/semesters reports (and optional charts) for many transcript files.
+
+    Returns a summary dict with the counts and the (path, message) errors.
+    """
+    scale = get_scale(scale)
+    os.makedirs(output_dir, exist_ok=True)
+    semester_tables, errors = [], []
+    course_count = rejected_count = done = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(report_batch, batch, scale.name) for batch in iter_batches(paths, files_per_task)]
+        for future in as_completed(futures):
+            tables, courses, rejected, batch_errors = future.result()
+            semester_tables.extend(tables)
+            course_count += courses
+            rejected_count += rejected
+            errors.extend(batch_errors)
+            done += 1
+            log(f"Processed {min(done * files_per_task, len(paths))}/{len(paths)} files")
+
+        if not semester_tables:
+            return {'files': len(paths), 'students': 0, 'courses': 0, 'rejected': rejected_count,
+                    'charts': 0, 'errors': errors}
+
+        students, semesters = merge_semester_tables(semester_tables)
+        _write_report(students, os.path.join(output_dir, f'students.{fmt}'), fmt)
+        _write_report(semesters, os.path.join(output_dir, f'semesters.{fmt}'), fmt)
+
+        chart_count = 0
+        if charts:
+            chart_dir = os.path.join(output_dir, 'charts')
+            os.makedirs(chart_dir, exist_ok=True)
+            student_ids = list(students.index)
+            futures = [
+                pool.submit(write_student_charts, semesters.loc[batch], chart_dir, scale.max_points)
+                for batch in iter_batches(student_ids, STUDENTS_PER_CHART_TASK)
+            ]
+            for future in as_completed(futures):
+                chart_count += future.result()
+            log(f"Wrote {chart_count} charts")
+
+    return {'files': len(paths), 'students': len(students), 'courses': course_count,
+            'rejected': rejected_count, 'charts': chart_count, 'errors': errors}
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Generate per-student GPA reports for a directory of transcripts.")
+    parser.add_argument('input_dir', help="directory of transcript CSV files")
+    parser.add_argument('output_dir', help="directory to write the reports to")
+    parser.add_argument('--format', choices=list(REPORT_FORMATS), default='csv', help="report file format")
+    parser.add_argument('--scale', choices=list(GRADING_SCALES), default=DEFAULT_SCALE, help="grading scale")
+    parser.add_argument('--charts', action='store_true', help="also write a GPA trend PNG per student")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--files-per-task', type=int, default=FILES_PER_TASK,
+                        help="transcript files handed to a worker at a time")
+    args = parser.parse_args(argv)
+
+    paths = find_transcripts(args.input_dir)
+    if not paths:
+        print(f"No transcript CSV files found in {args.input_dir}", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    summary = generate_reports(paths, args.output_dir, fmt=args.format, scale=args.scale, charts=args.charts,
+                               workers=args.workers, files_per_task=args.files_per_task,
+                               log=lambda message: print(message, file=sys.stderr))
+
+    for path, message in summary['errors']:
+        print(f"Skipped {path}: {message}", file=sys.stderr)
+    print(f"{summary['students']} students, {summary['courses']} courses from {summary['files']} files "
+          f"({summary['rejected']} rows rejected) in {time.perf_counter() - start:.1f}s -> {args.output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
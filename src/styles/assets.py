@@ -0,0 +1,72 @@
+"""
+CSS and image assets for the GPA Insight application
+
+Streamlit drops any element a rerun does not emit again, so styles have to be
+injected on every run. What this module avoids is the repeated work and
+traffic: stylesheets are minified once per process and images are read and
+base64-encoded once per file version, so every run emits byte-identical
+markup. Streamlit's forward-message cache then sends the browser only a hash
+reference for any element it already holds (see `global.minCachedMessageSize`
+in .streamlit/config.toml), instead of the full payload.
+"""
+
+import base64
+import mimetypes
+import os
+import re
+import threading
+
+import streamlit as st
+
+_lock = threading.Lock()
+# CSS source -> minified <style> block
+_style_blocks = {}
+# Image path -> ((mtime_ns, size), data URI)
+_data_uris = {}
+
+_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+_CSS_WHITESPACE = re.compile(r'\s+')
+_CSS_PUNCTUATION = re.compile(r'\s*([{};,>])\s*')
+_CSS_COLON = re.compile(r':\s+')
+
+
+def minify_css(css):
+    """Strip comments and insignificant whitespace from a stylesheet."""
+    css = _CSS_COMMENT.sub('', css)
+    css = _CSS_WHITESPACE.sub(' ', css)
+    css = _CSS_PUNCTUATION.sub(r'\1', css)
+    # Space before a colon can be a descendant combinator (`div :hover`); after one it never matters
+    css = _CSS_COLON.sub(':', css)
+    return css.replace(';}', '}').strip()
+
+
+def style_block(css):
+    """Return the minified `<style>` block for `css`, minifying each stylesheet only once."""
+    block = _style_blocks.get(css)
+    if block is None:
+        block = f"<style>{minify_css(css)}</style>"
+        with _lock:
+            _style_blocks[css] = block
+    return block
+
+
+def image_data_uri(path):
+    """Return a file as a base64 `data:` URI, re-reading it only when its mtime or size changes."""
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _data_uris.get(path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with open(path, 'rb') as f:
+        encoded = base64.b64encode(f.read()).decode()
+    mime_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    uri = f"data:{mime_type};base64,{encoded}"
+    with _lock:
+        _data_uris[path] = (version, uri)
+    return uri
+
+
+def inject_css(css):
+    """Emit a stylesheet on this run as a minified, cache-friendly `<style>` block."""
+    st.markdown(style_block(css), unsafe_allow_html=True)
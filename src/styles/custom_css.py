@@ -1,8 +1,7 @@
-import streamlit as st
+from styles.assets import inject_css
 
-def apply_custom_css():
-    st.markdown("""
-    <style>
+# Application stylesheet; minified once per process by the asset manager
+CUSTOM_CSS = """
         /* Main theme colors */
         :root {
             --primary-color: #4A90E2;
@@ -460,5 +459,8 @@ def apply_custom_css():
         .stMarkdown div {
             display: block !important;
         }
-    </style>
-    """, unsafe_allow_html=True)
\ No newline at end of file
+"""
+
+def apply_custom_css():
+    """Inject the application stylesheet."""
+    inject_css(CUSTOM_CSS)
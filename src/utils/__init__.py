@@ -11,9 +11,18 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 COURSES_DATA_FILE = os.path.join(BASE_DIR, 'data', 'courses.json')
 GRADES_DATA_FILE = os.path.join(BASE_DIR, 'data', 'grades.json')
 
+# Define the directory for the course logs of named profiles
+PROFILES_DIR = os.path.join(BASE_DIR, 'data', 'profiles')
+
+# Define the directory for rendered static chart images
+FIGURE_CACHE_DIR = os.path.join(BASE_DIR, 'data', 'figures')
+
 # Define a constant for the minimum passing grade
 MIN_PASSING_GRADE = 60
 
+# Define a constant for the minimum number of credits
+MIN_CREDITS = 1
+
 # Define a constant for the maximum number of credits
 MAX_CREDITS = 21
 
@@ -34,6 +43,3 @@ APP_NAME = 'GPA Insight'
 
 # Define a constant for the welcome message
 WELCOME_MESSAGE = f'Welcome to {APP_NAME}, version {APP_VERSION}!'
-
-# Print the welcome message
-print(WELCOME_MESSAGE)
\ No newline at end of file
@@ -0,0 +1,98 @@
+"""
+Running GPA aggregates for the GPA Insight application
+"""
+
+from collections import Counter
+from .grading import get_scale
+
+
+class GPAAggregate:
+    """Running totals over a transcript, updated in O(1) per course."""
+
+    def __init__(self):
+        self.course_count = 0
+        self.total_credits = 0
+        self.grade_counts = Counter()
+        self.grade_credits = Counter()
+        self.semester_counts = Counter()
+        self.semester_credits = Counter()
+        self.semester_grade_credits = Counter()
+
+    @classmethod
+    def from_frame(cls, courses_df):
+        """Build an aggregate from an existing DataFrame of courses."""
+        aggregate = cls()
+        aggregate.add_frame(courses_df)
+        return aggregate
+
+    def add(self, semester, credits, grade):
+        """Account for a single added course."""
+        self._update(semester, credits, grade, 1)
+
+    def remove(self, semester, credits, grade):
+        """Account for a single removed course."""
+        self._update(semester, credits, grade, -1)
+
+    def add_frame(self, courses_df):
+        """Account for a batch of added courses in one grouped pass."""
+        if courses_df.empty:
+            return
+
+        # Group once by (semester, grade); every counter is derived from it
+        grouped = courses_df.groupby(['Semester', 'Grade'], sort=False, observed=True)['Credits'].agg(['count', 'sum'])
+
+        for (semester, grade), count, credits in grouped.itertuples(name=None):
+            count = int(count)
+            self.course_count += count
+            self.total_credits += credits
+            self.grade_counts[grade] += count
+            self.grade_credits[grade] += credits
+            self.semester_counts[semester] += count
+            self.semester_credits[semester] += credits
+            self.semester_grade_credits[semester, grade] += credits
+
+    def _update(self, semester, credits, grade, sign):
+        self.course_count += sign
+        self.total_credits += sign * credits
+        self.grade_counts[grade] += sign
+        self.grade_credits[grade] += sign * credits
+        self.semester_counts[semester] += sign
+        self.semester_credits[semester] += sign * credits
+        self.semester_grade_credits[semester, grade] += sign * credits
+
+        # Drop emptied buckets so semesters and grades disappear with their last course
+        if self.grade_counts[grade] <= 0:
+            for counter in (self.grade_counts, self.grade_credits):
+                counter.pop(grade, None)
+        if self.semester_counts[semester] <= 0:
+            for counter in (self.semester_counts, self.semester_credits):
+                counter.pop(semester, None)
+        if self.semester_grade_credits[semester, grade] == 0:
+            del self.semester_grade_credits[semester, grade]
+
+    def total_points(self, scale=None):
+        """Credit-weighted grade points; unknown grades count as zero like calculate_gpa.
+
+        Credits are kept per grade label, so any grading scale applies without a rescan.
+        """
+        points = get_scale(scale).points
+        return sum(points.get(grade, 0.0) * credits for grade, credits in self.grade_credits.items())
+
+    def gpa(self, scale=None):
+        """Cumulative GPA over every course in the aggregate."""
+        if self.total_credits == 0:
+            return 0.0
+        return self.total_points(scale) / self.total_credits
+
+    def semester_gpa(self, semester, scale=None):
+        """GPA for a single semester."""
+        credits = self.semester_credits.get(semester, 0)
+        if credits == 0:
+            return 0.0
+        grade_values = get_scale(scale).points
+        points = sum(
+            grade_values.get(grade, 0.0) * grade_credits
+            for (sem, grade), grade_credits in self.semester_grade_credits.items()
+            if sem == semester
+        )
+        return points / credits
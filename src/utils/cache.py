@@ -0,0 +1,240 @@
+"""
+Caching helpers for the GPA Insight application
+"""
+
+import functools
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .grading import GradingScale
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry."""
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """Return the cached value for `key`, marking it as recently used."""
+        if key not in self._entries:
+            return default
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def get_or_create(self, key, factory):
+        """Return the cached value for `key`, building it with `factory()` on a miss."""
+        try:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        except KeyError:
+            pass
+
+        value = factory()
+        self._entries[key] = value
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return value
+
+    def values(self):
+        return list(self._entries.values())
+
+    def clear(self):
+        self._entries.clear()
+
+
+def estimate_size(value):
+    """Approximate bytes held by a cached value."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True, index=True)
+        return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if hasattr(value, 'to_plotly_json'):
+        # Plotly figure: its JSON spec is a fair proxy for the arrays it holds
+        return len(value.to_json())
+    if isinstance(value, tuple):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+_MISSING = object()
+
+
+class SharedCache:
+    """Thread-safe LRU shared by every session, bounded by entries, bytes and age.
+
+    Entries older than `ttl` seconds are treated as misses. When either bound
+    is exceeded the least recently used entries are evicted. Values are shared
+    between sessions, so callers must not mutate them.
+    """
+
+    def __init__(self, name, maxsize=256, max_bytes=None, ttl=None, sizeof=estimate_size):
+        self.name = name
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.hits = self.misses = self.evictions = self.expirations = 0
+        self.nbytes = 0
+        # key -> (value, size, expiry)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return _MISSING
+        if entry[2] is not None and entry[2] <= time.monotonic():
+            self._discard(key)
+            self.expirations += 1
+            self.misses += 1
+            return _MISSING
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def _discard(self, key):
+        _, size, _ = self._entries.pop(key)
+        self.nbytes -= size
+
+    def get(self, key, default=None):
+        """Return the cached value for `key`, or `default` on a miss or expiry."""
+        with self._lock:
+            value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def set(self, key, value):
+        """Store `value`; a value larger than `max_bytes` on its own is not cached."""
+        size = self.sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        expiry = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (value, size, expiry)
+            self.nbytes += size
+            while len(self._entries) > self.maxsize or (self.max_bytes is not None and self.nbytes > self.max_bytes):
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+
+    def get_or_create(self, key, factory):
+        """Return the cached value for `key`, building it with `factory()` on a miss.
+
+        The factory runs outside the lock, so two sessions missing the same key
+        at once may both build it; the later result replaces the earlier one.
+        """
+        with self._lock:
+            value = self._lookup(key)
+        if value is _MISSING:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        """Counters and current size, for the profiling panel and metrics."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.nbytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+
+_shared_caches = {}
+_registry_lock = threading.Lock()
+
+
+def shared_cache(name, **options):
+    """Return the process-wide cache called `name`, creating it with `options` on first use."""
+    with _registry_lock:
+        cache = _shared_caches.get(name)
+        if cache is None:
+            cache = _shared_caches[name] = SharedCache(name, **options)
+        return cache
+
+
+def clear_shared_caches():
+    """Empty every shared cache, keeping their stats."""
+    with _registry_lock:
+        caches = list(_shared_caches.values())
+    for cache in caches:
+        cache.clear()
+
+
+def cache_stats():
+    """{cache name: stats()} for every shared cache."""
+    with _registry_lock:
+        caches = list(_shared_caches.values())
+    return {cache.name: cache.stats() for cache in caches}
+
+
+def frame_digest(df, columns=None):
+    """Content hash of a DataFrame (optionally only some columns), stable across sessions."""
+    if columns is not None:
+        df = df[list(columns)]
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((list(df.columns), [str(dtype) for dtype in df.dtypes], len(df))).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _key_part(value, columns):
+    if isinstance(value, pd.DataFrame):
+        return ('frame', frame_digest(value, columns))
+    if isinstance(value, GradingScale):
+        return ('scale', value.name)
+    return value
+
+
+def memoize(name, columns=None, **options):
+    """Cache a pure function's results in the shared cache `name`.
+
+    DataFrame arguments are keyed by a hash of their contents (restricted to
+    `columns` when given), so equal transcripts in different sessions share
+    one result. DataFrame results are handed out as shallow copies, which
+    copy-on-write keeps from altering the cached frame.
+    """
+    def decorate(func):
+        cache = shared_cache(name, **options)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (tuple(_key_part(arg, columns) for arg in args),
+                   tuple(sorted((k, _key_part(v, columns)) for k, v in kwargs.items())))
+            value = cache.get_or_create(key, lambda: func(*args, **kwargs))
+            if isinstance(value, (pd.DataFrame, pd.Series)):
+                return value.copy(deep=False)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+    return decorate
@@ -0,0 +1,72 @@
+"""
+Cohort-wide GPA aggregation for the GPA Insight application
+"""
+
+import numpy as np
+import pandas as pd
+
+from .helpers import grade_points, semester_sort_key
+from .profiling import timed
+
+STUDENT_COLUMN = 'Student ID'
+
+
+def _with_gpa(totals):
+    """Add a GPA column from summed credits and weighted points."""
+    credits = totals['Credits'].to_numpy(dtype=float)
+    weighted = totals['Weighted Points'].to_numpy(dtype=float)
+    totals['GPA'] = np.divide(weighted, credits, out=np.zeros_like(weighted), where=credits > 0)
+    return totals
+
+
+def _natural_semesters(semesters):
+    """Semester labels as an ordered categorical, so 'Semester 10.1' follows 'Semester 9.2'."""
+    semesters = semesters.astype('category')
+    return semesters.cat.reorder_categories(
+        sorted(semesters.cat.categories, key=semester_sort_key), ordered=True)
+
+
+def _gpa_tables(frame, student_column):
+    """Group (student, semester) rows of Courses, Credits and Weighted Points into GPA tables."""
+    semesters = frame.groupby([student_column, 'Semester'], observed=True, sort=True)[
+        ['Courses', 'Credits', 'Weighted Points']].sum()
+    students = semesters.groupby(level=0, observed=True).sum()
+
+    # Running totals within each student give the GPA as of the end of every semester
+    running = semesters[['Credits', 'Weighted Points']].groupby(level=0, observed=True).cumsum()
+    semesters = _with_gpa(semesters)
+    semesters['Cumulative GPA'] = _with_gpa(running)['GPA']
+
+    return _with_gpa(students), semesters
+
+
+@timed()
+def cohort_gpa_tables(courses_df, student_column=STUDENT_COLUMN, scale=None):
+    """Compute per-student and per-student-semester GPAs for a whole cohort.
+
+    Both tables come from one grouped sum over (student, semester); the
+    per-student totals are a second, much smaller sum over that result.
+    Returns ``(students, semesters)``: `students` is indexed by student with
+    Courses, Credits, Weighted Points and GPA; `semesters` has the same
+    columns plus Cumulative GPA, indexed by (student, semester).
+    """
+    credits = courses_df['Credits'].astype(float)
+    frame = pd.DataFrame({
+        student_column: courses_df[student_column],
+        'Semester': _natural_semesters(courses_df['Semester']),
+        'Courses': np.ones(len(courses_df), dtype=np.int64),
+        'Credits': credits,
+        'Weighted Points': grade_points(courses_df['Grade'], scale).astype(float).fillna(0.0) * credits,
+    })
+    return _gpa_tables(frame, student_column)
+
+
+def merge_semester_tables(semester_tables, student_column=STUDENT_COLUMN):
+    """Combine `semesters` tables from several cohort_gpa_tables calls into one pair.
+
+    A student or semester split across sources is summed back together, so
+    the result matches cohort_gpa_tables over the concatenated courses.
+    """
+    frame = pd.concat([table.reset_index() for table in semester_tables], ignore_index=True)
+    frame['Semester'] = _natural_semesters(frame['Semester'].astype(object))
+    return _gpa_tables(frame, student_column)
@@ -5,6 +5,37 @@ GRADE_POINTS = {
     "D": 1.0,
     "F": 0.0,
 }
+PLUS_MINUS_GRADE_POINTS = {
+    "A+": 4.0, "A": 4.0, "A-": 3.7,
+    "B+": 3.3, "B": 3.0, "B-": 2.7,
+    "C+": 2.3, "C": 2.0, "C-": 1.7,
+    "D+": 1.3, "D": 1.0, "D-": 0.7,
+    "F": 0.0,
+}
+TEN_POINT_GRADE_POINTS = {
+    "O": 10.0,
+    "A+": 9.0,
+    "A": 8.0,
+    "B+": 7.0,
+    "B": 6.0,
+    "C": 5.0,
+    "P": 4.0,
+    "F": 0.0,
+}
 DIFFICULTY_LEVELS = ["Easy", "Medium", "Hard"]
+DIFFICULTY_MULTIPLIERS = {
+    "Easy": 0.8,
+    "Medium": 1.0,
+    "Hard": 1.3,
+}
+WEEK_DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
 SUBJECTS = ["Math", "Science", "History"]
-STUDY_TIPS = ["Review notes", "Practice problems", "Group study"]
\ No newline at end of file
+STUDY_TIPS = ["Review notes", "Practice problems", "Group study"]
+SEMESTERS = [
+    "Semester 1.1", "Semester 1.2",
+    "Semester 2.1", "Semester 2.2",
+    "Semester 3.1", "Semester 3.2",
+    "Semester 4.1", "Semester 4.2",
+    "Semester 5.1", "Semester 5.2",
+    "Semester 6.1", "Semester 6.2"
+]
@@ -0,0 +1,85 @@
+"""
+Chunked course export for the GPA Insight application
+"""
+
+import io
+
+# Rows serialised per chunk; keeps intermediate buffers small for large transcripts
+EXPORT_CHUNK_ROWS = 50_000
+
+# Format label -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    'CSV': ('csv', 'text/csv'),
+    'JSONL': ('jsonl', 'application/x-ndjson'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'Arrow': ('arrow', 'application/vnd.apache.arrow.file'),
+}
+
+
+def iter_chunks(courses_df, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Yield consecutive row slices of a DataFrame."""
+    for start in range(0, len(courses_df), chunk_rows):
+        yield courses_df.iloc[start:start + chunk_rows]
+
+
+def _write_csv(courses_df, out, chunk_rows):
+    text = io.TextIOWrapper(out, encoding='utf-8', newline='')
+    for i, chunk in enumerate(iter_chunks(courses_df, chunk_rows)):
+        chunk.to_csv(text, index=False, header=(i == 0))
+    text.flush()
+    text.detach()
+
+
+def _write_jsonl(courses_df, out, chunk_rows):
+    for chunk in iter_chunks(courses_df, chunk_rows):
+        lines = chunk.to_json(orient='records', lines=True, date_format='iso')
+        out.write(lines.encode('utf-8'))
+        if not lines.endswith('\n'):
+            out.write(b'\n')
+
+
+def _arrow_batches(courses_df, chunk_rows):
+    import pyarrow as pa
+
+    schema = pa.Schema.from_pandas(courses_df, preserve_index=False)
+    return schema, (pa.RecordBatch.from_pandas(chunk, schema=schema, preserve_index=False)
+                    for chunk in iter_chunks(courses_df, chunk_rows))
+
+
+def _write_parquet(courses_df, out, chunk_rows):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema, batches = _arrow_batches(courses_df, chunk_rows)
+    with pq.ParquetWriter(out, schema) as writer:
+        for batch in batches:
+            writer.write_table(pa.Table.from_batches([batch]))
+
+
+def _write_arrow(courses_df, out, chunk_rows):
+    import pyarrow.ipc as ipc
+
+    schema, batches = _arrow_batches(courses_df, chunk_rows)
+    with ipc.new_file(out, schema) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+
+
+_WRITERS = {
+    'CSV': _write_csv,
+    'JSONL': _write_jsonl,
+    'Parquet': _write_parquet,
+    'Arrow': _write_arrow,
+}
+
+
+def export_courses(courses_df, fmt, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Serialise courses to `fmt` chunk by chunk and return the bytes.
+
+    Parquet and Arrow need pyarrow and raise ImportError without it.
+    """
+    if fmt not in _WRITERS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    out = io.BytesIO()
+    _WRITERS[fmt](courses_df, out, chunk_rows)
+    return out.getvalue()
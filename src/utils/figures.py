@@ -0,0 +1,163 @@
+"""
+Static chart rendering for the GPA Insight application
+"""
+
+import atexit
+import hashlib
+import os
+import threading
+import time
+
+from . import FIGURE_CACHE_DIR
+
+# Format label -> (file extension, MIME type)
+FIGURE_FORMATS = {
+    'PNG': ('png', 'image/png'),
+    'SVG': ('svg', 'image/svg+xml'),
+    'PDF': ('pdf', 'application/pdf'),
+}
+
+# Bounds of the on-disk image cache; the least recently used images go first
+FIGURE_CACHE_MAX_BYTES = 256 << 20
+FIGURE_CACHE_MAX_AGE = 7 * 24 * 3600
+
+
+def figure_key(fig, fmt, width=None, height=None, scale=None):
+    """Hash of a figure's full spec and the output options; equal figures share a key."""
+    digest = hashlib.sha256(fig.to_json().encode('utf-8'))
+    digest.update(f"|{fmt}|{width}|{height}|{scale}".encode('utf-8'))
+    return digest.hexdigest()
+
+
+class FigureRenderer:
+    """Render plotly figures to PNG/SVG/PDF through one long-lived kaleido server.
+
+    Starting kaleido launches a headless Chrome, which costs far more than
+    rendering one figure, so the server is started on first use and kept
+    until the process exits. Rendered images are cached on disk under the
+    hash of the figure spec, so an unchanged chart is rendered once until
+    it is evicted: images unused for `max_age` seconds are dropped, and the
+    least recently used ones go when the cache outgrows `max_bytes`.
+    """
+
+    def __init__(self, cache_dir=FIGURE_CACHE_DIR, processes=1, max_bytes=FIGURE_CACHE_MAX_BYTES,
+                 max_age=FIGURE_CACHE_MAX_AGE):
+        self.cache_dir = cache_dir
+        self.processes = processes
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._started = False
+        self._lock = threading.Lock()
+        # Bytes on disk as of the last prune plus what was written since; None until the first prune
+        self._cache_bytes = None
+
+    def _cache_path(self, key, fmt):
+        extension = FIGURE_FORMATS[fmt][0]
+        return os.path.join(self.cache_dir, key[:2], f"{key}.{extension}")
+
+    def start(self):
+        """Start the shared kaleido server if it is not running yet."""
+        with self._lock:
+            if self._started:
+                return
+            import kaleido
+
+            # The server thread dies silently if Chrome is missing and later calls block
+            # forever, so let the constructor's ChromeNotFoundError surface here instead
+            kaleido.Kaleido(n=self.processes)
+            kaleido.start_sync_server(n=self.processes, silence_warnings=True)
+            self._started = True
+            atexit.register(self.close)
+
+    def close(self):
+        """Stop the kaleido server."""
+        with self._lock:
+            if not self._started:
+                return
+            import kaleido
+
+            kaleido.stop_sync_server(silence_warnings=True)
+            self._started = False
+
+    def prune(self):
+        """Delete expired images, then the least recently used ones until the cache fits `max_bytes`."""
+        entries = []
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        expired_before = time.time() - self.max_age
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, path in sorted(entries):
+            if mtime >= expired_before and total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        with self._lock:
+            self._cache_bytes = total
+
+    def _read_cached(self, path):
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        # Eviction goes by modification time, so a hit marks the image as recently used
+        os.utime(path)
+        return data
+
+    def render(self, fig, fmt='PNG', width=None, height=None, scale=None):
+        """Return the image bytes for `fig`, from the disk cache when possible.
+
+        Raises ImportError without kaleido, and kaleido's ChromeNotFoundError
+        when no Chrome is available to render with.
+        """
+        if fmt not in FIGURE_FORMATS:
+            raise ValueError(f"Unsupported figure format: {fmt}")
+        path = self._cache_path(figure_key(fig, fmt, width, height, scale), fmt)
+        data = self._read_cached(path)
+        if data is not None:
+            return data
+
+        self.start()
+        import kaleido
+
+        # kaleido 1.x takes the image options as one dict; left-out keys use the figure's own layout
+        options = {'format': FIGURE_FORMATS[fmt][0], 'width': width, 'height': height, 'scale': scale}
+        data = kaleido.calc_fig_sync(fig, opts={name: value for name, value in options.items() if value is not None})
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write under a unique name first so concurrent renders of one figure never see a partial file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._cache_bytes is not None:
+                self._cache_bytes += len(data)
+            over = self._cache_bytes is None or self._cache_bytes > self.max_bytes
+        if over:
+            self.prune()
+        return data
+
+
+_renderer = None
+_renderer_lock = threading.Lock()
+
+
+def get_renderer():
+    """Return the process-wide renderer shared by every session."""
+    global _renderer
+    with _renderer_lock:
+        if _renderer is None:
+            _renderer = FigureRenderer()
+        return _renderer
@@ -0,0 +1,206 @@
+"""
+GPA goal planning for the GPA Insight application
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from .grading import get_scale
+from .profiling import timed
+
+
+# Largest choice table (candidates x step budget) solved exactly; larger plans keep the greedy result
+MAX_EXACT_CELLS = 2_000_000
+
+PLAN_COLUMNS = ['Course', 'Credits', 'Current Grade', 'Target Grade', 'Steps']
+
+
+def _baseline_future_grade(current_gpa, grades, points):
+    """Grade a future course is assumed to earn: the best one not above the current GPA."""
+    reachable = [grade for grade, pts in zip(grades, points) if pts <= current_gpa + 1e-9]
+    return reachable[0] if reachable else grades[-1]
+
+
+def _raise_gains(points, credit, rank, current):
+    """Gain of raising a course by 0, 1, ... `rank` steps."""
+    return np.concatenate([[0.0], (points[rank - 1::-1] - current) * credit])
+
+
+def _envelope(gains):
+    """Step counts at the corners of the upper concave envelope of `gains`."""
+    corners = [0]
+    while corners[-1] < len(gains) - 1:
+        start = corners[-1]
+        slopes = (gains[start + 1:] - gains[start]) / np.arange(1, len(gains) - start)
+        # argmax takes the nearest of equally steep corners, keeping segments short
+        corners.append(start + 1 + int(np.argmax(slopes)))
+    return corners
+
+
+def _greedy_steps(points, credits, ranks, current, needed):
+    """Steps per candidate from a greedy pass over (credits, grade) classes.
+
+    Candidates with the same credits and points are interchangeable, so the
+    work is per class: each class's gains are cut into segments along their
+    concave envelope, and whole segments are taken in order of gain per
+    step until the target is met. The result is feasible and at most a few
+    steps above the minimum.
+    """
+    # Hash each column and combine the codes; sorting whole rows is far slower on big transcripts
+    combined = np.zeros(len(credits), dtype=np.int64)
+    for column in (credits, ranks, current):
+        codes, uniques = pd.factorize(column)
+        combined = combined * len(uniques) + codes
+    class_of, _ = pd.factorize(combined)
+    counts = np.bincount(class_of)
+    # Codes follow first appearance, so a class starts where its code first exceeds every earlier one
+    first = np.flatnonzero(np.r_[True, class_of[1:] > np.maximum.accumulate(class_of)[:-1]])
+    keys = np.column_stack([credits[first], ranks[first], current[first]])
+
+    gains = [_raise_gains(points, credit, int(rank), point) for credit, rank, point in keys]
+    segments = []
+    for klass, class_gains in enumerate(gains):
+        corners = _envelope(class_gains)
+        for start, end in zip(corners, corners[1:]):
+            segments.append((klass, start, end, class_gains[end] - class_gains[start]))
+    seg_class, seg_start, seg_end, seg_gain = (np.array(column) for column in zip(*segments))
+    seg_class, seg_start, seg_end = seg_class.astype(np.intp), seg_start.astype(np.intp), seg_end.astype(np.intp)
+
+    order = np.lexsort((seg_start, -seg_gain / (seg_end - seg_start)))
+    cumulative = np.cumsum(seg_gain[order] * counts[seg_class[order]])
+    last = min(int(np.searchsorted(cumulative, needed - 1e-9)), len(order) - 1)
+
+    # Every earlier segment is taken by the whole class; a class's segments come in envelope order
+    depth = np.zeros(len(keys), dtype=np.intp)
+    np.maximum.at(depth, seg_class[order[:last]], seg_end[order[:last]])
+
+    # Only as many of the crossing class as needed take its segment, the last one maybe only part of it
+    cross = order[last]
+    klass, start, end = seg_class[cross], seg_start[cross], seg_end[cross]
+    remaining = needed - (cumulative[last - 1] if last else 0.0)
+    takers = max(1, math.ceil(remaining / seg_gain[cross] - 1e-9))
+    partial = gains[klass][start + 1:end + 1] - gains[klass][start]
+    last_end = start + 1 + int(np.argmax(partial >= remaining - (takers - 1) * seg_gain[cross] - 1e-9))
+
+    by_class = np.argsort(class_of, kind='stable')
+    position = np.empty(len(class_of), dtype=np.intp)
+    position[by_class] = np.arange(len(class_of)) - (np.cumsum(counts) - counts)[class_of[by_class]]
+    steps = depth[class_of]
+    crossing = class_of == klass
+    steps[crossing & (position < takers - 1)] = end
+    steps[crossing & (position == takers - 1)] = last_end
+    return steps
+
+
+def _exact_steps(points, credits, ranks, current, needed, budget):
+    """Steps per candidate from a multiple-choice knapsack over at most `budget` steps."""
+    # dp[c] = best gain using exactly c steps; choice[i, c] = target rank picked for candidate i
+    dp = np.full(budget + 1, -np.inf)
+    dp[0] = 0.0
+    choice = np.full((len(ranks), budget + 1), -1, dtype=np.int8)
+    for i, (credit, rank, point) in enumerate(zip(credits, ranks, current)):
+        updated = dp.copy()
+        for target_rank in range(rank):
+            steps = rank - target_rank
+            if steps > budget:
+                continue
+            gain = (points[target_rank] - point) * credit
+            shifted = dp[:budget + 1 - steps] + gain
+            better = shifted > updated[steps:]
+            updated[steps:][better] = shifted[better]
+            choice[i, steps:][better] = target_rank
+        dp = updated
+
+    # Walk the choices back from the cheapest feasible budget
+    cost = int(np.flatnonzero(dp >= needed - 1e-9)[0])
+    result = np.zeros(len(ranks), dtype=np.intp)
+    for i in range(len(ranks) - 1, -1, -1):
+        target_rank = choice[i, cost]
+        if target_rank >= 0:
+            result[i] = ranks[i] - target_rank
+            cost -= result[i]
+    return result
+
+
+@timed()
+def plan_target_gpa(courses_df, target_gpa, future_credits=0, future_course_credits=3, future_grade=None,
+                    scale=None):
+    """Find the cheapest set of grade improvements that reaches `target_gpa`.
+
+    Candidates are the existing courses (retaken for a better grade) and
+    `future_credits` worth of planned courses, each assumed to earn
+    `future_grade` (by default the best grade not above the current GPA).
+    Raising a course by one letter costs one step. A greedy pass over
+    classes of interchangeable candidates gives a plan and a step budget,
+    and while the candidates x budget table stays within MAX_EXACT_CELLS a
+    multiple-choice knapsack over that budget finds the minimum. Larger
+    transcripts keep the greedy plan, which is at most a few steps above it.
+
+    Returns ``(plan, projected_gpa)`` where `plan` is a DataFrame of the
+    changes, or None if the target cannot be reached. In that case
+    `projected_gpa` is the best GPA achievable. Steps are counted on
+    `scale` (letter by default).
+    """
+    scale = get_scale(scale)
+    grades = sorted(scale.grades, key=scale.points.get, reverse=True)
+    points = np.array([scale.points[grade] for grade in grades])
+
+    credits = courses_df['Credits'].to_numpy(dtype=float)
+    current_points = np.nan_to_num(scale.grade_points(courses_df['Grade']).to_numpy(dtype=float))
+    total_credits = credits.sum()
+    current_gpa = current_points @ credits / total_credits if total_credits else 0.0
+
+    # Future courses are extra items starting from the baseline grade
+    if future_grade is None:
+        future_grade = _baseline_future_grade(current_gpa, grades, points)
+    course_count = math.ceil(future_credits / future_course_credits) if future_credits else 0
+    future = np.full(course_count, float(future_course_credits))
+    if course_count and future_credits % future_course_credits:
+        future[-1] = future_credits % future_course_credits
+
+    item_credits = np.concatenate([credits, future])
+    item_points = np.concatenate([current_points, np.full(course_count, scale.points[future_grade])])
+
+    all_credits = item_credits.sum()
+    needed = target_gpa * all_credits - item_points @ item_credits
+    best_gpa = points[0] if all_credits else 0.0
+
+    if needed <= 1e-9:
+        return pd.DataFrame(columns=PLAN_COLUMNS), (item_points @ item_credits) / all_credits if all_credits else 0.0
+    if best_gpa * all_credits - item_points @ item_credits < needed - 1e-9:
+        return None, best_gpa
+
+    # Rank of each item's current grade on the ordered scale; only strictly better grades are options
+    ranks = np.searchsorted(-points, -item_points, side='left')
+    candidates = np.flatnonzero(ranks > 0)
+
+    options = (points, item_credits[candidates], ranks[candidates], item_points[candidates], needed)
+    steps = _greedy_steps(*options)
+    budget = int(steps.sum())
+    if len(candidates) * (budget + 1) <= MAX_EXACT_CELLS:
+        steps = _exact_steps(*options, budget)
+
+    chosen = candidates[steps > 0]
+    steps = steps[steps > 0]
+    target_ranks = ranks[chosen] - steps
+    gain = (points[target_ranks] - item_points[chosen]) @ item_credits[chosen]
+
+    existing = chosen < len(courses_df)
+    course_rows = chosen[existing]
+    labels = [f"{code}: {name}" for code, name in zip(courses_df['Course Code'].to_numpy()[course_rows],
+                                                       courses_df['Course Name'].to_numpy()[course_rows])]
+    labels += [f"Future course {i + 1}" for i in chosen[~existing] - len(courses_df)]
+    current_grades = [str(grade) for grade in courses_df['Grade'].to_numpy()[course_rows]]
+    current_grades += [future_grade] * int((~existing).sum())
+
+    plan = pd.DataFrame({
+        'Course': labels,
+        'Credits': item_credits[chosen],
+        'Current Grade': current_grades,
+        'Target Grade': np.array(grades, dtype=object)[target_ranks],
+        'Steps': steps,
+    }, columns=PLAN_COLUMNS)
+    projected_gpa = (item_points @ item_credits + gain) / all_credits
+    return plan, projected_gpa
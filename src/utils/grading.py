@@ -0,0 +1,91 @@
+"""
+Grading scales for the GPA Insight application
+"""
+
+import numpy as np
+import pandas as pd
+
+from . import MIN_PASSING_GRADE
+from .constants import GRADE_POINTS, PLUS_MINUS_GRADE_POINTS, TEN_POINT_GRADE_POINTS
+
+DEFAULT_SCALE = 'letter'
+
+
+class GradingScale:
+    """A grade -> points table compiled to NumPy arrays for index-based lookups.
+
+    `points` lists grades from best to worst. `bands` optionally maps
+    percentages to grades as (minimum percentage, grade) pairs.
+    """
+
+    def __init__(self, name, label, points, bands=()):
+        self.name = name
+        self.label = label
+        self.points = dict(points)
+        self.grades = list(self.points)
+        self.max_points = max(self.points.values())
+        self.bands = sorted(bands)
+
+        self._index = pd.Index(self.grades, dtype=object)
+        # Trailing NaN is what get_indexer's -1 (unknown grade) lands on
+        self._table = np.append(np.fromiter(self.points.values(), dtype=float), np.nan)
+        self._band_floors = np.array([floor for floor, _ in self.bands], dtype=float)
+        self._band_grades = np.array([grade for _, grade in self.bands], dtype=object)
+
+    def __repr__(self):
+        return f"GradingScale({self.name!r})"
+
+    def compile(self, categories):
+        """Dense points lookup for categorical codes; the trailing NaN catches code -1."""
+        return np.append(self._table[self._index.get_indexer(categories)], np.nan)
+
+    def grade_points(self, grades):
+        """Map a Series of grade labels to points; unknown grades become NaN."""
+        if isinstance(grades.dtype, pd.CategoricalDtype):
+            values = self.compile(grades.cat.categories)[grades.cat.codes.to_numpy()]
+        else:
+            values = self._table[self._index.get_indexer(np.asarray(grades, dtype=object))]
+        return pd.Series(values, index=grades.index)
+
+    def label_points(self, labels, missing=0.0):
+        """Points for an array of grade labels; unknown labels score `missing`."""
+        values = self._table[self._index.get_indexer(np.asarray(labels, dtype=object))]
+        return np.where(np.isnan(values), missing, values)
+
+    def grades_for_percentages(self, percentages):
+        """Turn an array of percentages into grades; NaN or unbanded values give None."""
+        if not self.bands:
+            raise ValueError(f"Grading scale {self.name} has no percentage bands")
+        percentages = np.asarray(percentages, dtype=float)
+        positions = np.searchsorted(self._band_floors, percentages, side='right') - 1
+        grades = self._band_grades[np.clip(positions, 0, None)]
+        return np.where((positions < 0) | np.isnan(percentages), None, grades)
+
+
+GRADING_SCALES = {}
+
+
+def register_scale(scale):
+    """Make a grading scale selectable by its name."""
+    GRADING_SCALES[scale.name] = scale
+    return scale
+
+
+def get_scale(name=None):
+    """Look up a registered scale; None gives the default letter scale."""
+    if isinstance(name, GradingScale):
+        return name
+    try:
+        return GRADING_SCALES[name or DEFAULT_SCALE]
+    except KeyError:
+        raise ValueError(f"Unknown grading scale: {name}") from None
+
+
+register_scale(GradingScale('letter', 'Letter (A–F)', GRADE_POINTS))
+register_scale(GradingScale('plus_minus', 'Letter with +/- (A+–F)', PLUS_MINUS_GRADE_POINTS))
+register_scale(GradingScale('ten_point', '10-point (O–F)', TEN_POINT_GRADE_POINTS))
+register_scale(GradingScale(
+    'percentage', 'Percentage bands',
+    GRADE_POINTS,
+    bands=[(0, 'F'), (MIN_PASSING_GRADE, 'D'), (70, 'C'), (80, 'B'), (90, 'A')],
+))
@@ -1,30 +1,71 @@
+import re
+import numpy as np
 import pandas as pd
 from datetime import datetime
-from .constants import GRADE_POINTS
+from .cache import memoize
+from .grading import get_scale
+from .planner import course_study_hours
+from .profiling import timed
 
-def calculate_gpa(courses_df):
+# Shared by every session: identical transcripts are tabulated once per process
+SHARED_TABLE_CACHE = {'maxsize': 512, 'max_bytes': 32 << 20, 'ttl': 3600}
+
+def grade_points(grades, scale=None):
+    """Map a Series of grade labels to grade points on a grading scale (letter by default)."""
+    return get_scale(scale).grade_points(grades)
+
+@timed()
+def calculate_gpa(courses_df, scale=None):
     """Calculate GPA from a DataFrame of courses."""
     if courses_df.empty:
         return 0.0
     
-    # Create a copy to avoid the SettingWithCopyWarning
-    df = courses_df.copy()
-    
-    # Map grades to points
-    df['Points'] = df['Grade'].map(GRADE_POINTS)
-    
-    # Calculate weighted points (points * credits)
-    df['Weighted Points'] = df['Points'] * df['Credits']
+    # Weighted points (points * credits) without adding columns to a copy of the courses
+    weighted_points = grade_points(courses_df['Grade'], scale) * courses_df['Credits']
     
     # Calculate GPA
-    total_weighted_points = df['Weighted Points'].sum()
-    total_credits = df['Credits'].sum()
+    total_weighted_points = weighted_points.sum()
+    total_credits = courses_df['Credits'].sum()
     
     if total_credits == 0:
         return 0.0
     else:
         return total_weighted_points / total_credits
 
+def semester_sort_key(label):
+    """Natural sort key, so 'Semester 10.1' sorts after 'Semester 9.2'."""
+    return [(0, int(part), '') if part.isdigit() else (1, 0, part.lower())
+            for part in re.split(r'(\d+)', str(label)) if part]
+
+@timed()
+@memoize('semester_gpa_table', columns=['Semester', 'Credits', 'Grade'], **SHARED_TABLE_CACHE)
+def semester_gpa_table(courses_df, scale=None):
+    """Per-semester and cumulative GPA in one grouped pass, semesters in natural order."""
+    columns = ['Semester', 'Courses', 'Credits', 'GPA', 'Cumulative GPA']
+    if courses_df.empty:
+        return pd.DataFrame(columns=columns)
+    
+    # Weighted points per course; unknown grades count as zero like calculate_gpa
+    totals = pd.DataFrame({
+        'Credits': courses_df['Credits'].astype(float),
+        'Weighted Points': grade_points(courses_df['Grade'], scale).fillna(0.0) * courses_df['Credits'],
+    }).groupby(courses_df['Semester'], observed=True).agg(
+        Courses=('Credits', 'size'),
+        Credits=('Credits', 'sum'),
+        **{'Weighted Points': ('Weighted Points', 'sum')},
+    )
+    totals = totals.loc[sorted(totals.index, key=semester_sort_key)]
+    
+    credits = totals['Credits'].to_numpy()
+    weighted = totals['Weighted Points'].to_numpy()
+    running_credits = credits.cumsum()
+    totals['GPA'] = np.divide(weighted, credits, out=np.zeros_like(weighted), where=credits > 0)
+    totals['Cumulative GPA'] = np.divide(weighted.cumsum(), running_credits,
+                                         out=np.zeros_like(weighted), where=running_credits > 0)
+    
+    totals.index = totals.index.astype(object)
+    return totals.reset_index()[columns]
+
 def add_course(courses_df, semester, code, name, credits, grade):
     """Add a new course to the DataFrame."""
     new_course = pd.DataFrame({
@@ -42,33 +83,64 @@ def delete_course(courses_df, index):
     """Delete a course from the DataFrame."""
     return courses_df.drop(index).reset_index(drop=True)
 
-def recommend_study_time(difficulty, credits, target_grade):
-    """Calculate recommended study time based on course parameters."""
-    base_hours = 2
-    
-    difficulty_multiplier = {
-        'Easy': 0.8,
-        'Moderate': 1.0,
-        'Challenging': 1.3,
-        'Very Difficult': 1.6
-    }
-    
-    grade_multiplier = {
-        'A+': 1.4, 'A': 1.3, 'A-': 1.2,
-        'B+': 1.1, 'B': 1.0, 'B-': 0.9,
-        'C+': 0.8, 'C': 0.7, 'C-': 0.6,
-        'D+': 0.5, 'D': 0.4, 'D-': 0.3
-    }
-    
-    recommended_hours = base_hours * credits * difficulty_multiplier.get(difficulty, 1.0) * grade_multiplier.get(target_grade, 1.0)
-    
-    return round(recommended_hours, 1)
+def recommend_study_time(difficulty, credits, target_grade, scale=None):
+    """Calculate recommended weekly study time for one course."""
+    return round(course_study_hours(difficulty, credits, target_grade, scale), 1)
 
-def simulate_gpa(courses_df, modified_courses):
+def simulate_gpa(courses_df, modified_courses, scale=None):
     """Simulate GPA with modified grades."""
-    df = courses_df.copy()
-    
-    for index, new_grade in modified_courses.items():
-        df.at[index, 'Grade'] = new_grade
-    
-    return calculate_gpa(df) 
\ No newline at end of file
+    return float(simulate_gpa_batch(courses_df, [modified_courses], scale)[0])
+
+@timed()
+def simulate_gpa_batch(courses_df, scenarios, scale=None):
+    """Simulate GPA for many grade-override scenarios in one NumPy pass.
+
+    `scenarios` is either a 2-D array/DataFrame of grade labels shaped
+    (n_scenarios, n_courses), where None or NaN keeps the current grade, or a
+    list of {index: new_grade} dicts keyed like `courses_df.index`.
+    Each scenario only contributes credits * (new points - current points)
+    for the courses it changes, added to the baseline totals.
+    """
+    scale = get_scale(scale)
+    credits = courses_df['Credits'].to_numpy(dtype=float)
+    # Unknown grades score 0 like calculate_gpa
+    base_points = np.nan_to_num(scale.grade_points(courses_df['Grade']).to_numpy(dtype=float))
+    total_credits = credits.sum()
+    base_weighted = base_points @ credits
+
+    if isinstance(scenarios, (np.ndarray, pd.DataFrame)):
+        overrides = np.asarray(scenarios, dtype=object)
+        keep = pd.isna(overrides)
+        new_points = scale.label_points(overrides.ravel()).reshape(overrides.shape)
+        deltas = np.where(keep, 0.0, new_points - base_points) @ credits
+    else:
+        # Sparse scenarios: scatter each change into its scenario's total
+        scenario_ids, indices, grades = [], [], []
+        for scenario_id, overrides in enumerate(scenarios):
+            scenario_ids.extend([scenario_id] * len(overrides))
+            indices.extend(overrides.keys())
+            grades.extend(overrides.values())
+        positions = courses_df.index.get_indexer(indices)
+        if (positions < 0).any():
+            raise KeyError("Scenario references a course that is not in the DataFrame")
+        changes = (scale.label_points(grades) - base_points[positions]) * credits[positions]
+        deltas = np.bincount(np.asarray(scenario_ids, dtype=np.intp), weights=changes, minlength=len(scenarios))
+
+    if total_credits == 0:
+        return np.zeros(len(deltas))
+    return (base_weighted + deltas) / total_credits
+
+def simulate_retake_gpas(courses_df, new_grade, scale=None):
+    """GPA after retaking each course on its own for `new_grade`, one value per course.
+
+    Same result as simulate_gpa_batch with one {index: new_grade} scenario per
+    course, computed straight from the columns without building the scenarios.
+    """
+    scale = get_scale(scale)
+    credits = courses_df['Credits'].to_numpy(dtype=float)
+    base_points = np.nan_to_num(scale.grade_points(courses_df['Grade']).to_numpy(dtype=float))
+    total_credits = credits.sum()
+    if total_credits == 0:
+        return np.zeros(len(credits))
+    new_points = float(scale.label_points([new_grade])[0])
+    return (base_points @ credits + (new_points - base_points) * credits) / total_credits
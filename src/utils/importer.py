@@ -0,0 +1,90 @@
+"""
+Streaming CSV import for the GPA Insight application
+"""
+
+import re
+from datetime import datetime
+
+import pandas as pd
+
+from . import MAX_CREDITS, MIN_CREDITS
+from .grading import get_scale
+
+REQUIRED_COLUMNS = ['Semester', 'Course Code', 'Course Name', 'Credits', 'Grade']
+
+# Rows parsed per chunk; bounds parser memory regardless of upload size
+IMPORT_CHUNK_ROWS = 50_000
+
+_SEMESTER_PATTERN = re.compile(r'^(?:sem(?:ester)?\.?\s*)?(\d{1,2})\s*[.\-/]\s*(\d)$', re.IGNORECASE)
+
+
+def normalize_semester(label):
+    """Turn '1.2', 'sem 1-2' or 'SEMESTER 1.2' into 'Semester 1.2'; None if unrecognised."""
+    match = _SEMESTER_PATTERN.match(label.strip())
+    if match is None:
+        return None
+    return f"Semester {int(match.group(1))}.{match.group(2)}"
+
+
+def missing_columns(file, extra_columns=()):
+    """Return the required columns absent from a CSV file's header."""
+    header = pd.read_csv(file, nrows=0).columns.str.strip()
+    file.seek(0)
+    return [col for col in [*extra_columns, *REQUIRED_COLUMNS] if col not in header]
+
+
+def validate_chunk(chunk, extra_columns=(), scale=None):
+    """Split a raw chunk into normalised valid courses and rejected rows with a reason.
+
+    `extra_columns` (e.g. a student ID) are carried through stripped and must be non-empty.
+    Grades must belong to `scale`; on a scale with percentage bands, numeric
+    grades are converted to the matching band.
+    """
+    scale = get_scale(scale)
+    chunk = chunk.rename(columns=str.strip)
+    extras = {col: chunk[col].str.strip() for col in extra_columns}
+    text = chunk[['Semester', 'Course Code', 'Course Name', 'Grade']].apply(lambda col: col.str.strip())
+
+    grades = text['Grade'].str.upper()
+    if scale.bands:
+        percentages = pd.to_numeric(grades, errors='coerce')
+        numeric = percentages.notna().to_numpy()
+        grades = grades.mask(numeric, pd.Series(scale.grades_for_percentages(percentages), index=grades.index))
+    credits = pd.to_numeric(chunk['Credits'], errors='coerce')
+    # Semester labels repeat heavily, so normalise each distinct label once
+    semesters = text['Semester'].map({label: normalize_semester(label) for label in text['Semester'].unique()})
+
+    errors = pd.Series('', index=chunk.index, dtype=object)
+    errors[text['Course Code'] == ''] = 'missing course code'
+    errors[text['Course Name'] == ''] = 'missing course name'
+    errors[semesters.isna()] = 'unrecognised semester'
+    errors[~((credits >= MIN_CREDITS) & (credits <= MAX_CREDITS) & (credits % 1 == 0))] = (
+        f'credits must be a whole number from {MIN_CREDITS} to {MAX_CREDITS}')
+    errors[~grades.isin(scale.grades)] = 'unknown grade'
+    for col, values in extras.items():
+        errors[values == ''] = f'missing {col}'
+    valid = (errors == '').to_numpy()
+
+    courses = pd.DataFrame({
+        **{col: values[valid] for col, values in extras.items()},
+        'Semester': semesters[valid],
+        'Course Code': text['Course Code'][valid],
+        'Course Name': text['Course Name'][valid],
+        'Credits': credits[valid].astype('int8'),
+        'Grade': grades[valid],
+    })
+    if 'Timestamp' in chunk.columns:
+        courses['Timestamp'] = pd.to_datetime(chunk['Timestamp'][valid], errors='coerce').fillna(pd.Timestamp(datetime.now()))
+    else:
+        courses['Timestamp'] = pd.Timestamp(datetime.now())
+
+    rejected = chunk[~valid].assign(Error=errors[~valid])
+    return courses, rejected
+
+
+def iter_course_chunks(file, chunksize=IMPORT_CHUNK_ROWS, extra_columns=(), scale=None):
+    """Stream a CSV upload as (valid courses, rejected rows, bytes read) per chunk."""
+    reader = pd.read_csv(file, chunksize=chunksize, dtype=str, keep_default_na=False, skipinitialspace=True)
+    for chunk in reader:
+        courses, rejected = validate_chunk(chunk, extra_columns, scale)
+        yield courses, rejected, file.tell()
@@ -0,0 +1,61 @@
+"""
+Session memory accounting for the GPA Insight application
+"""
+
+import io
+import sys
+import types
+
+import numpy as np
+import pandas as pd
+
+from .cache import LRUCache, estimate_size
+from .store import CourseStore
+
+# Nested containers and objects are followed this deep; past it only the object itself counts
+MAX_DEPTH = 6
+
+_OPAQUE_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def deep_size(value, _seen=None, _depth=0):
+    """Approximate bytes reachable from `value`, counting each object once."""
+    seen = set() if _seen is None else _seen
+    if id(value) in seen or isinstance(value, _OPAQUE_TYPES):
+        return 0
+    seen.add(id(value))
+
+    if isinstance(value, CourseStore):
+        return value.memory_usage(deep=True)
+    if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray, bytes, bytearray, str)) or hasattr(value, 'to_plotly_json'):
+        return estimate_size(value)
+    if isinstance(value, io.BytesIO):
+        return value.getbuffer().nbytes
+    if _depth >= MAX_DEPTH:
+        return sys.getsizeof(value)
+
+    size = sys.getsizeof(value)
+    if isinstance(value, LRUCache):
+        children = value.values()
+    elif isinstance(value, dict):
+        children = [item for pair in value.items() for item in pair]
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        children = value
+    elif hasattr(value, '__dict__'):
+        children = vars(value).values()
+    else:
+        children = [getattr(value, slot) for slot in getattr(type(value), '__slots__', ()) if hasattr(value, slot)]
+    return size + sum(deep_size(child, seen, _depth + 1) for child in children)
+
+
+def session_memory_report(session_state):
+    """Approximate memory per session-state key, largest first.
+
+    Objects reachable from several keys are counted under the first one
+    only. Values shared with other sessions, such as figures from the
+    process-wide cache, are included.
+    """
+    seen = set()
+    rows = [(str(key), type(value).__name__, deep_size(value, seen)) for key, value in session_state.items()]
+    report = pd.DataFrame(rows, columns=['Key', 'Type', 'Bytes'])
+    return report.sort_values('Bytes', ascending=False, ignore_index=True)
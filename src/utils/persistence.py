@@ -0,0 +1,280 @@
+"""
+On-disk persistence for the GPA Insight application
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from . import COURSES_DATA_FILE, PROFILES_DIR
+from .store import COURSE_COLUMNS, CourseStore
+
+
+# Profile whose courses live in the original courses.json, so existing data keeps loading
+DEFAULT_PROFILE = 'default'
+
+
+def profile_log_path(profile):
+    """Course log file of a profile; names differing only in case or surrounding spaces share one."""
+    name = (profile or '').strip().casefold()
+    if name in ('', DEFAULT_PROFILE):
+        return COURSES_DATA_FILE
+    slug = re.sub(r'[^a-z0-9]+', '-', name).strip('-')[:40]
+    digest = hashlib.sha256(name.encode('utf-8')).hexdigest()[:12]
+    return os.path.join(PROFILES_DIR, f'{slug}-{digest}.json' if slug else f'{digest}.json')
+
+
+class CourseLog:
+    """Binary snapshot plus an append-only JSON-lines log of later changes.
+
+    Each log line records one change to rows named by their store row id:
+    ``{"op": "add", "ids": [...], "rows": [...]}``,
+    ``{"op": "update", "ids": [...], "rows": [...]}`` or
+    ``{"op": "delete", "ids": [...]}``, so a save only writes the change
+    itself. Compaction folds everything into a `CourseStore.snapshot()` file
+    and starts a fresh log. Both files carry a generation number so a crash
+    between the two writes never replays changes twice.
+
+    One log holds one profile's transcript (see `profile_log_path`). Every
+    browser session opens its own log, and sessions on the same profile share
+    its files: writes happen under an exclusive lock file, and each one first
+    catches the session's store up with what other sessions wrote since it
+    last read the files (reloading from the snapshot when another session
+    compacted), so no session's changes are lost or applied to the wrong rows.
+    Profiles only separate transcripts; they are not access control.
+    """
+
+    def __init__(self, path=COURSES_DATA_FILE, compact_every=500):
+        self.path = path
+        base = os.path.splitext(path)[0]
+        self.snapshot_path = base + '.snapshot'
+        self.lock_path = base + '.lock'
+        self.compact_every = compact_every
+        self.generation = 0
+        # Bytes of the log already applied to this session's store
+        self.offset = 0
+        self.ops_since_compaction = 0
+        # Set when loading failed; saving would then overwrite courses this session never saw
+        self.load_error = None
+
+    def load(self):
+        """Restore the snapshot and replay the log written after it."""
+        try:
+            with _file_lock(self.lock_path):
+                return self._read()
+        except Exception as e:
+            self.load_error = e
+            raise
+
+    def append(self, store):
+        """Write the store's pending changes to the log, after catching up with other sessions."""
+        self._check_loaded()
+        if not store.changes:
+            return
+        with _file_lock(self.lock_path):
+            self._save(store)
+
+    @property
+    def needs_compaction(self):
+        return self.ops_since_compaction > self.compact_every
+
+    def compact(self, store):
+        """Write a snapshot of the store and start an empty log."""
+        self._check_loaded()
+        with _file_lock(self.lock_path):
+            self._save(store)
+            generation = self.generation + 1
+            header = f'{generation}\n'.encode('ascii')
+            begin = json.dumps({'op': 'begin', 'generation': generation}) + '\n'
+            # Snapshot first: until the new log lands, its generation marks the old log as stale
+            _atomic_write(self.snapshot_path, header + store.snapshot(), 'wb')
+            _atomic_write(self.path, begin, 'w')
+            self.generation = generation
+            self.offset = len(begin.encode('utf-8'))
+            self.ops_since_compaction = 0
+
+    def _check_loaded(self):
+        if self.load_error is not None:
+            raise RuntimeError(f"saving is disabled because the saved courses could not be loaded ({self.load_error})")
+
+    def _read(self):
+        """Build a store from the snapshot and the whole log."""
+        store = CourseStore()
+        self.generation = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'rb') as f:
+                self.generation, data = _split_header(f.read())
+            store = CourseStore.from_snapshot(data)
+        self.offset = 0
+        self.ops_since_compaction = 0
+        self._replay(store)
+        return store
+
+    def _replay(self, store):
+        """Apply the log lines after `offset` to the store and move `offset` past them."""
+        if not os.path.exists(self.path):
+            self.offset = 0
+            return
+        added_ids, added_rows = [], []
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            for line in f:
+                try:
+                    entry = json.loads(line) if line.endswith(b'\n') else None
+                except ValueError:
+                    entry = None
+                if entry is None:
+                    # A torn final line from an interrupted write; everything before it is intact
+                    break
+                if entry['op'] == 'begin':
+                    if entry['generation'] != self.generation:
+                        # Log predates the snapshot, which already contains its changes
+                        break
+                elif entry['op'] == 'add' and 'ids' in entry:
+                    added_ids.extend(entry['ids'])
+                    added_rows.extend(entry['rows'])
+                    self.ops_since_compaction += 1
+                else:
+                    # Apply buffered adds first so updates and deletes see every earlier row
+                    _add_rows(store, added_ids, added_rows)
+                    added_ids, added_rows = [], []
+                    _apply_entry(store, entry)
+                    self.ops_since_compaction += 1
+                self.offset += len(line)
+        _add_rows(store, added_ids, added_rows)
+        store.changes.clear()
+
+    def _save(self, store):
+        """Catch the store up with the files, then append its pending changes; call with the lock held."""
+        pending, store.changes = store.changes, []
+        try:
+            if _snapshot_generation(self.snapshot_path) != self.generation:
+                # Another session compacted; its snapshot holds everything, so start over from it
+                store.replace_with(self._read())
+                for op, payload in pending:
+                    _apply_change(store, op, payload)
+                store.changes.clear()
+            else:
+                self._replay(store)
+        except Exception:
+            store.changes = pending
+            raise
+
+        if not pending:
+            return
+        lines = []
+        if self.offset == 0:
+            lines.append({'op': 'begin', 'generation': self.generation})
+        for op, payload in pending:
+            if op == 'delete':
+                lines.append({'op': 'delete', 'ids': [int(i) for i in payload]})
+            else:
+                row_ids, rows = payload
+                lines.append({'op': op, 'ids': [int(i) for i in row_ids], 'rows': _rows_payload(rows)})
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'ab') as f:
+            # Drop a torn tail or a stale log that _replay stopped at
+            f.truncate(self.offset)
+            f.write(''.join(json.dumps(line) + '\n' for line in lines).encode('utf-8'))
+            f.flush()
+            os.fsync(f.fileno())
+            self.offset = f.tell()
+        self.ops_since_compaction += len(pending)
+
+
+@contextmanager
+def _file_lock(path):
+    """Hold an exclusive lock on `path` across processes and threads."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _split_header(data):
+    """Split the generation line off a snapshot file."""
+    header, _, body = data.partition(b'\n')
+    return int(header), body
+
+
+def _snapshot_generation(path):
+    """Generation of the snapshot on disk, 0 when there is none."""
+    try:
+        with open(path, 'rb') as f:
+            return int(f.readline())
+    except FileNotFoundError:
+        return 0
+
+
+def _atomic_write(path, content, mode):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    # A temp name of its own, so concurrent writers never share one
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode, **({} if 'b' in mode else {'encoding': 'utf-8'})) as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _rows_payload(courses_df):
+    """Serialise courses as JSON-ready row lists in COURSE_COLUMNS order."""
+    df = courses_df[COURSE_COLUMNS].astype({'Semester': object, 'Grade': object, 'Credits': int})
+    df['Timestamp'] = pd.to_datetime(df['Timestamp']).dt.strftime('%Y-%m-%dT%H:%M:%S.%f')
+    return df.to_numpy(dtype=object).tolist()
+
+
+def _add_rows(store, row_ids, rows):
+    if rows:
+        store.add_courses(pd.DataFrame(rows, columns=COURSE_COLUMNS), row_ids=row_ids)
+
+
+def _apply_change(store, op, payload):
+    """Apply one of the store's own change records to another store, by row id."""
+    if op == 'add':
+        store.add_courses(payload[1], row_ids=payload[0])
+    elif op == 'update':
+        store.update_rows(payload[0], payload[1])
+    else:
+        store.delete_rows(payload)
+
+
+def _apply_entry(store, entry):
+    """Apply a log line other than a row-id add."""
+    rows = pd.DataFrame(entry['rows'], columns=COURSE_COLUMNS) if 'rows' in entry else None
+    if 'ids' in entry:
+        _apply_change(store, entry['op'], entry['ids'] if rows is None else (entry['ids'], rows))
+    # Logs written before row ids name rows by position
+    elif entry['op'] == 'add':
+        store.add_courses(rows)
+    elif entry['op'] == 'update':
+        store.update_courses(entry['indices'], rows)
+    elif entry['op'] == 'delete':
+        store.delete_courses(entry['indices'])
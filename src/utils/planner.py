@@ -0,0 +1,94 @@
+"""
+Semester study planning for the GPA Insight application
+"""
+
+import numpy as np
+import pandas as pd
+
+from .constants import DIFFICULTY_LEVELS, DIFFICULTY_MULTIPLIERS, WEEK_DAYS
+from .grading import get_scale
+from .profiling import timed
+
+# Weekly study hours per credit for a medium course aimed at a middling grade
+STUDY_HOURS_PER_CREDIT = 2.0
+# Hours scheduled in one sitting; the weekly plan is packed in blocks of this size
+STUDY_BLOCK_HOURS = 0.5
+DEFAULT_MAX_HOURS_PER_DAY = 4.0
+
+PLAN_COLUMNS = ['Course Name', 'Difficulty', 'Credits', 'Target Grade']
+
+# Difficulty multipliers in DIFFICULTY_LEVELS order, plus 1.0 for unknown levels
+_DIFFICULTY_FACTORS = np.array([DIFFICULTY_MULTIPLIERS[level] for level in DIFFICULTY_LEVELS] + [1.0])
+
+
+def study_hours(difficulties, credits, target_grades, scale=None):
+    """Recommended weekly study hours for many courses in one array pass.
+
+    Hours grow with credits, difficulty and the target grade's share of the
+    scale's best grade points (0.1x for a zero-point grade up to 1.3x for
+    the best). Unknown difficulties and grades use a 1.0 multiplier.
+    """
+    scale = get_scale(scale)
+    difficulty_factor = _DIFFICULTY_FACTORS[pd.Index(DIFFICULTY_LEVELS).get_indexer(np.asarray(difficulties, dtype=object))]
+    target_points = scale.label_points(np.asarray(target_grades, dtype=object), missing=np.nan)
+    grade_factor = np.nan_to_num(0.1 + 1.2 * target_points / scale.max_points, nan=1.0)
+    return STUDY_HOURS_PER_CREDIT * np.asarray(credits, dtype=float) * difficulty_factor * grade_factor
+
+
+def course_study_hours(difficulty, credits, target_grade, scale=None):
+    """`study_hours` for a single course, without the array overhead."""
+    scale = get_scale(scale)
+    target_points = scale.points.get(target_grade)
+    grade_factor = 1.0 if target_points is None else 0.1 + 1.2 * target_points / scale.max_points
+    return STUDY_HOURS_PER_CREDIT * credits * DIFFICULTY_MULTIPLIERS.get(difficulty, 1.0) * grade_factor
+
+
+def _pack_blocks(blocks, day_count, blocks_per_day):
+    """Lay the courses' study blocks out over the week, all in array operations.
+
+    Each course's k-th block is ranked (k + 0.5) / its block count, which
+    interleaves the courses in proportion to their size. Walking that order
+    and filling the days in turn keeps every day within a block of the
+    others. Once the week is full, the remaining blocks (the same share of
+    every course) are left unscheduled. Returns the (courses, days) block
+    counts and the unscheduled blocks per course.
+    """
+    course_of_block = np.repeat(np.arange(len(blocks)), blocks)
+    nth_block = np.arange(len(course_of_block)) - np.repeat(np.cumsum(blocks) - blocks, blocks)
+    order = course_of_block[np.lexsort((course_of_block, (nth_block + 0.5) / blocks[course_of_block]))]
+
+    placed = order[:day_count * blocks_per_day]
+    packed = np.zeros((len(blocks), day_count), dtype=np.int64)
+    np.add.at(packed, (placed, np.arange(len(placed)) % day_count), 1)
+    unscheduled = np.bincount(order[len(placed):], minlength=len(blocks))
+    return packed, unscheduled
+
+
+@timed()
+def plan_study_week(courses_df, max_hours_per_day=DEFAULT_MAX_HOURS_PER_DAY, days=WEEK_DAYS, scale=None):
+    """Recommend study hours for a semester's courses and pack them into a week.
+
+    `courses_df` has the PLAN_COLUMNS. Hours are scheduled in
+    STUDY_BLOCK_HOURS blocks, spread so that every day carries a similar
+    load and no day exceeds `max_hours_per_day`.
+
+    Returns ``(plan, calendar)``. `plan` is `courses_df` with 'Hours/Week'
+    and 'Unscheduled Hours' added, where the latter is what did not fit
+    under the daily limit. `calendar` has Day, Course Name and Hours for
+    every non-empty slot, with days in `days` order.
+    """
+    hours = study_hours(courses_df['Difficulty'], courses_df['Credits'], courses_df['Target Grade'], scale)
+    blocks = np.rint(hours / STUDY_BLOCK_HOURS).astype(np.int64)
+    packed, unscheduled = _pack_blocks(blocks, len(days), int(max_hours_per_day // STUDY_BLOCK_HOURS))
+
+    plan = courses_df[PLAN_COLUMNS].assign(**{
+        'Hours/Week': blocks * STUDY_BLOCK_HOURS,
+        'Unscheduled Hours': unscheduled * STUDY_BLOCK_HOURS,
+    })
+    course_index, day_index = np.nonzero(packed)
+    calendar = pd.DataFrame({
+        'Day': pd.Categorical.from_codes(day_index, categories=list(days), ordered=True),
+        'Course Name': courses_df['Course Name'].to_numpy()[course_index],
+        'Hours': packed[course_index, day_index] * STUDY_BLOCK_HOURS,
+    }).sort_values(['Day', 'Course Name'], ignore_index=True)
+    return plan, calendar
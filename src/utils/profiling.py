@@ -0,0 +1,239 @@
+"""
+Rerun profiling for the GPA Insight application
+
+Set GPA_INSIGHT_PROFILE=1 to record timing spans. Each rerun's spans are kept
+for the in-app debug panel, written as one JSON line to the
+'gpa_insight.profile' logger, and folded into process-wide totals served in
+OpenMetrics text format on http://127.0.0.1:9464/metrics (set
+GPA_INSIGHT_METRICS_PORT to change the port, or to 0 to turn it off).
+
+When profiling is off, `timed` returns the function unchanged and `span`
+returns a shared no-op context manager, so instrumented code costs nothing
+measurable.
+"""
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .cache import cache_stats
+
+ENABLED = os.environ.get('GPA_INSIGHT_PROFILE', '').lower() in ('1', 'true', 'yes', 'on')
+METRICS_HOST = os.environ.get('GPA_INSIGHT_METRICS_HOST', '127.0.0.1')
+METRICS_PORT = int(os.environ.get('GPA_INSIGHT_METRICS_PORT', '9464'))
+METRICS_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+logger = logging.getLogger('gpa_insight.profile')
+if ENABLED and not logger.handlers:
+    # One JSON object per line on stderr unless the host configures the logger itself
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+
+# Spans of the rerun running on this thread; Streamlit runs each session's script on its own thread
+_run = threading.local()
+_lock = threading.Lock()
+# Span name -> [count, total seconds, max seconds]
+_totals = {}
+_reruns = 0
+_store_bytes = None
+_server = None
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('name', 'start', 'depth')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.depth = getattr(_run, 'depth', 0)
+        _run.depth = self.depth + 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self.start
+        _run.depth = self.depth
+        spans = getattr(_run, 'spans', None)
+        if spans is not None:
+            spans.append((self.name, self.depth, seconds))
+        with _lock:
+            totals = _totals.get(self.name)
+            if totals is None:
+                _totals[self.name] = [1, seconds, seconds]
+            else:
+                totals[0] += 1
+                totals[1] += seconds
+                totals[2] = max(totals[2], seconds)
+        return False
+
+
+def span(name):
+    """Context manager timing the block under `name`."""
+    return _Span(name) if ENABLED else _NULL_SPAN
+
+
+def timed(name=None):
+    """Decorator timing every call of a function as a span (the function's name by default)."""
+    def decorate(func):
+        if not ENABLED:
+            return func
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Span(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def begin_run():
+    """Start collecting the spans of a new rerun on this thread."""
+    if not ENABLED:
+        return
+    _run.spans = []
+    _run.depth = 0
+    start_metrics_server()
+
+
+def current_run():
+    """(name, depth, seconds) for each span finished so far in this thread's rerun, in finish order."""
+    return list(getattr(_run, 'spans', ()))
+
+
+def end_run(store_bytes_before=None, store_bytes_after=None):
+    """Close this thread's rerun: count it, remember the store size and log its spans."""
+    global _reruns, _store_bytes
+    if not ENABLED:
+        return
+    with _lock:
+        _reruns += 1
+        if store_bytes_after is not None:
+            _store_bytes = store_bytes_after
+
+    record = {
+        'event': 'rerun',
+        'spans': [{'name': name, 'depth': depth, 'ms': round(seconds * 1000, 3)}
+                  for name, depth, seconds in current_run()],
+    }
+    if store_bytes_before is not None and store_bytes_after is not None:
+        record['store_bytes'] = store_bytes_after
+        record['store_bytes_delta'] = store_bytes_after - store_bytes_before
+    logger.info(json.dumps(record))
+
+
+def span_totals():
+    """Process-wide {name: (count, total seconds, max seconds)}."""
+    with _lock:
+        return {name: tuple(totals) for name, totals in _totals.items()}
+
+
+def _label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# Shared cache stat -> (OpenMetrics type, unit, help)
+_CACHE_METRICS = [
+    ('hits', 'counter', '', 'Shared cache lookups served from the cache.'),
+    ('misses', 'counter', '', 'Shared cache lookups that had to compute the value.'),
+    ('evictions', 'counter', '', 'Entries evicted to stay within the size bounds.'),
+    ('expirations', 'counter', '', 'Entries dropped because they outlived their TTL.'),
+    ('entries', 'gauge', '', 'Entries currently cached.'),
+    ('bytes', 'gauge', 'bytes', 'Approximate bytes currently cached.'),
+]
+
+
+def openmetrics():
+    """Render the process-wide totals in OpenMetrics text format."""
+    with _lock:
+        totals = sorted(_totals.items())
+        reruns, store_bytes = _reruns, _store_bytes
+
+    lines = [
+        '# TYPE gpa_insight_reruns counter',
+        '# HELP gpa_insight_reruns Script reruns profiled.',
+        f'gpa_insight_reruns_total {reruns}',
+        '# TYPE gpa_insight_span_seconds summary',
+        '# UNIT gpa_insight_span_seconds seconds',
+        '# HELP gpa_insight_span_seconds Time spent in each instrumented span.',
+    ]
+    for name, (count, total, _) in totals:
+        lines.append(f'gpa_insight_span_seconds_count{{span="{_label(name)}"}} {count}')
+        lines.append(f'gpa_insight_span_seconds_sum{{span="{_label(name)}"}} {total:.9f}')
+    lines += [
+        '# TYPE gpa_insight_span_max_seconds gauge',
+        '# UNIT gpa_insight_span_max_seconds seconds',
+        '# HELP gpa_insight_span_max_seconds Slowest single call of each instrumented span.',
+    ]
+    for name, (_, _, longest) in totals:
+        lines.append(f'gpa_insight_span_max_seconds{{span="{_label(name)}"}} {longest:.9f}')
+    if store_bytes is not None:
+        lines += [
+            '# TYPE gpa_insight_course_store_bytes gauge',
+            '# UNIT gpa_insight_course_store_bytes bytes',
+            '# HELP gpa_insight_course_store_bytes Course store size at the end of the last rerun.',
+            f'gpa_insight_course_store_bytes {store_bytes}',
+        ]
+    caches = sorted(cache_stats().items())
+    for metric, kind, unit, help_text in _CACHE_METRICS:
+        lines.append(f'# TYPE gpa_insight_cache_{metric} {kind}')
+        if unit:
+            lines.append(f'# UNIT gpa_insight_cache_{metric} {unit}')
+        lines.append(f'# HELP gpa_insight_cache_{metric} {help_text}')
+        suffix = '_total' if kind == 'counter' else ''
+        for name, stats in caches:
+            lines.append(f'gpa_insight_cache_{metric}{suffix}{{cache="{_label(name)}"}} {stats[metric]}')
+    lines.append('# EOF')
+    return '\n'.join(lines) + '\n'
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = openmetrics().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', METRICS_CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(host=METRICS_HOST, port=METRICS_PORT):
+    """Serve /metrics from a daemon thread, once per process; returns the server or None."""
+    global _server
+    if not port:
+        return None
+    with _lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            except OSError as e:
+                logger.warning("Metrics endpoint not started on %s:%s: %s", host, port, e)
+                _server = False
+                return None
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name='gpa-insight-metrics', daemon=True).start()
+        return _server or None
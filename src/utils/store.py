@@ -0,0 +1,331 @@
+"""
+Columnar course storage for the GPA Insight application
+"""
+
+import pickle
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .aggregate import GPAAggregate
+
+COURSE_COLUMNS = ['Semester', 'Course Code', 'Course Name', 'Credits', 'Grade', 'Timestamp']
+
+# Bumped whenever the snapshot layout changes; format 1 (no row ids) is upgraded on load, others are rejected
+SNAPSHOT_FORMAT = 2
+
+COLUMN_DTYPES = {
+    'Semester': np.dtype(np.int16),
+    'Course Code': np.dtype(object),
+    'Course Name': np.dtype(object),
+    'Credits': np.dtype(np.int8),
+    'Grade': np.dtype(np.int8),
+    'Timestamp': np.dtype('datetime64[ns]'),
+    # Random, so rows added by different sessions never share an id
+    'Row Id': np.dtype(np.int64),
+}
+
+
+class _Categories:
+    """Append-only label <-> code mapping backing a categorical column."""
+
+    def __init__(self, dtype, labels=()):
+        self.dtype = dtype
+        self.labels = list(labels)
+        self._codes = {label: code for code, label in enumerate(self.labels)}
+
+    def encode(self, label):
+        """Return the code for a label, registering it if unseen."""
+        code = self._codes.get(label)
+        if code is None:
+            code = self._codes[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+    def encode_many(self, labels):
+        """Vectorised encode for a batch of labels."""
+        uniques, inverse = np.unique(np.asarray(labels, dtype=object).astype(str), return_inverse=True)
+        mapping = np.array([self.encode(label) for label in uniques.tolist()], dtype=self.dtype)
+        return mapping[inverse.reshape(-1)]
+
+    def categorical(self, codes):
+        """Wrap a code array as a pandas Categorical without copying it."""
+        return pd.Categorical.from_codes(codes, categories=pd.Index(self.labels, dtype=object), validate=False)
+
+
+class CourseStore:
+    """Courses kept in preallocated, growable column arrays.
+
+    Semester and Grade are stored as categorical codes and Credits as int8, so
+    appends are amortised O(1) and a DataFrame view can be built without
+    re-parsing or copying the object columns. Frames handed out share the
+    buffers, so updates and deletes write into fresh copies once a frame
+    exists, leaving earlier frames unchanged. Every mutation is also queued in
+    `changes` so persistence can write just the delta, naming rows by their
+    stable row id rather than their position.
+    """
+
+    def __init__(self, capacity=64):
+        self._size = 0
+        self._semesters = _Categories(COLUMN_DTYPES['Semester'])
+        self._grades = _Categories(COLUMN_DTYPES['Grade'])
+        self._columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in COLUMN_DTYPES.items()}
+        self.aggregate = GPAAggregate()
+        self.version = 0
+        # Version of the last update or delete; appends leave it alone, so
+        # consumers can extend derived state from rows they have not seen yet
+        self.edit_version = 0
+        self.changes = []
+        self._frame = None
+        # Set while a frame handed out may still view the buffers
+        self._shared = False
+        self._rng = np.random.default_rng()
+
+    @classmethod
+    def from_frame(cls, courses_df):
+        """Build a store from an existing DataFrame of courses."""
+        store = cls(capacity=max(64, len(courses_df)))
+        store.add_courses(courses_df)
+        return store
+
+    @classmethod
+    def from_snapshot(cls, data):
+        """Restore a store from `snapshot()` bytes without any parsing or dtype inference."""
+        state = pickle.loads(data)
+        if state.get('format') not in (1, SNAPSHOT_FORMAT):
+            raise ValueError(f"Unsupported course snapshot format: {state.get('format')}")
+
+        store = cls(capacity=0)
+        store._semesters = _Categories(COLUMN_DTYPES['Semester'], state['semesters'])
+        store._grades = _Categories(COLUMN_DTYPES['Grade'], state['grades'])
+        columns = state['columns']
+        store._size = len(columns['Credits'])
+        if 'Row Id' not in columns:
+            columns = {**columns, 'Row Id': store._new_row_ids(store._size)}
+        store._columns = {name: np.asarray(columns[name], dtype=dtype) for name, dtype in COLUMN_DTYPES.items()}
+        store.aggregate = state['aggregate']
+        return store
+
+    def snapshot(self):
+        """Serialise the live rows, categories and aggregate as pickle protocol 5 bytes."""
+        n = self._size
+        return pickle.dumps({
+            'format': SNAPSHOT_FORMAT,
+            'semesters': self._semesters.labels,
+            'grades': self._grades.labels,
+            'columns': {name: column[:n] for name, column in self._columns.items()},
+            'aggregate': self.aggregate,
+        }, protocol=5)
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def empty(self):
+        return self._size == 0
+
+    @property
+    def nbytes(self):
+        """Bytes held by the column buffers; object columns count their references, not the strings."""
+        return sum(column.nbytes for column in self._columns.values())
+
+    def memory_usage(self, deep=False):
+        """Bytes held by the store; `deep` adds the course strings, category labels and pending changes."""
+        total = self.nbytes
+        if not deep:
+            return total
+        n = self._size
+        for name in ('Course Code', 'Course Name'):
+            total += sum(map(sys.getsizeof, self._columns[name][:n]))
+        total += sum(map(sys.getsizeof, self._semesters.labels + self._grades.labels))
+        # Pending rows reference the same strings, so only their buffers count
+        for op, payload in self.changes:
+            if op in ('add', 'update'):
+                total += int(payload[1].memory_usage(index=True).sum())
+        return total
+
+    def _reserve(self, extra):
+        """Grow every column geometrically so that `extra` more rows fit."""
+        needed = self._size + extra
+        capacity = len(self._columns['Credits'])
+        if needed <= capacity:
+            return
+        capacity = max(capacity, 1)
+        while capacity < needed:
+            capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+        self._shared = False
+
+    def _unshare(self):
+        """Copy the buffers before an in-place write if a frame may still view them."""
+        if self._shared:
+            self._columns = {name: column.copy() for name, column in self._columns.items()}
+            self._shared = False
+
+    def _rows(self, indices):
+        """Copy of the courses at positional `indices` as a DataFrame."""
+        columns = self._columns
+        return pd.DataFrame({
+            'Semester': self._semesters.categorical(columns['Semester'][indices]),
+            'Course Code': columns['Course Code'][indices],
+            'Course Name': columns['Course Name'][indices],
+            'Credits': columns['Credits'][indices],
+            'Grade': self._grades.categorical(columns['Grade'][indices]),
+            'Timestamp': columns['Timestamp'][indices],
+        }, columns=COURSE_COLUMNS)
+
+    def _new_row_ids(self, count):
+        return self._rng.integers(1, np.iinfo(np.int64).max, size=count, dtype=np.int64)
+
+    def _positions(self, row_ids):
+        """Positions of the given row ids, -1 for ids no longer in the store."""
+        live = pd.Index(self._columns['Row Id'][:self._size])
+        return live.get_indexer(np.asarray(row_ids, dtype=np.int64))
+
+    def _changed(self):
+        self.version += 1
+        self._frame = None
+
+    def add_course(self, semester, code, name, credits, grade, timestamp=None, row_id=None):
+        """Append a single course."""
+        self._reserve(1)
+        i = self._size
+        columns = self._columns
+        columns['Semester'][i] = self._semesters.encode(str(semester))
+        columns['Course Code'][i] = code
+        columns['Course Name'][i] = name
+        columns['Credits'][i] = credits
+        columns['Grade'][i] = self._grades.encode(str(grade))
+        columns['Timestamp'][i] = np.datetime64(timestamp or datetime.now(), 'ns')
+        columns['Row Id'][i] = self._new_row_ids(1)[0] if row_id is None else row_id
+        self._size += 1
+
+        self.aggregate.add(str(semester), int(credits), str(grade))
+        self.changes.append(('add', ([int(columns['Row Id'][i])], pd.DataFrame([[
+            str(semester), code, name, int(credits), str(grade), columns['Timestamp'][i],
+        ]], columns=COURSE_COLUMNS))))
+        self._changed()
+
+    def add_courses(self, courses_df, row_ids=None):
+        """Append a batch of courses from a DataFrame in one pass, with new row ids unless given."""
+        count = len(courses_df)
+        if count == 0:
+            return
+
+        self._reserve(count)
+        start, end = self._size, self._size + count
+        self._write_rows(slice(start, end), courses_df)
+        self._columns['Row Id'][start:end] = self._new_row_ids(count) if row_ids is None else row_ids
+        self._size = end
+        self._changed()
+
+        added = self._rows(np.arange(start, end))
+        self.aggregate.add_frame(added)
+        self.changes.append(('add', (self._columns['Row Id'][start:end].tolist(), added)))
+
+    def _write_rows(self, rows, courses_df):
+        """Encode a DataFrame's columns into the arrays at `rows` (a slice or index array)."""
+        columns = self._columns
+        columns['Semester'][rows] = self._semesters.encode_many(courses_df['Semester'])
+        columns['Course Code'][rows] = courses_df['Course Code'].to_numpy(dtype=object)
+        columns['Course Name'][rows] = courses_df['Course Name'].to_numpy(dtype=object)
+        columns['Credits'][rows] = courses_df['Credits'].to_numpy().astype(np.int8)
+        columns['Grade'][rows] = self._grades.encode_many(courses_df['Grade'])
+        if 'Timestamp' in courses_df.columns:
+            timestamps = pd.to_datetime(courses_df['Timestamp'], errors='coerce')
+            columns['Timestamp'][rows] = timestamps.fillna(pd.Timestamp(datetime.now())).to_numpy(dtype='datetime64[ns]')
+        elif isinstance(rows, slice):
+            columns['Timestamp'][rows] = np.datetime64(datetime.now(), 'ns')
+
+    def update_courses(self, indices, courses_df):
+        """Overwrite the courses at positional `indices` with the rows of `courses_df`."""
+        indices = np.asarray(indices, dtype=np.intp)
+        if len(indices) == 0:
+            return
+
+        previous = self._rows(indices)
+        for semester, credits, grade in zip(previous['Semester'], previous['Credits'], previous['Grade']):
+            self.aggregate.remove(semester, int(credits), grade)
+
+        self._unshare()
+        self._write_rows(indices, courses_df)
+        self._changed()
+        self.edit_version = self.version
+
+        updated = self._rows(indices)
+        self.aggregate.add_frame(updated)
+        self.changes.append(('update', (self._columns['Row Id'][indices].tolist(), updated)))
+
+    def update_rows(self, row_ids, courses_df):
+        """Overwrite the courses with the given row ids; ids no longer in the store are skipped."""
+        positions = self._positions(row_ids)
+        found = positions >= 0
+        self.update_courses(positions[found], courses_df[found])
+
+    def delete_course(self, index):
+        """Delete the course at a positional index."""
+        self.delete_courses([index])
+
+    def delete_courses(self, indices):
+        """Delete several courses by positional index, compacting once."""
+        indices = np.unique(np.asarray(indices, dtype=np.intp))
+        if len(indices) == 0:
+            return
+
+        removed = self._rows(indices)
+        removed_ids = self._columns['Row Id'][indices].tolist()
+        for semester, credits, grade in zip(removed['Semester'], removed['Credits'], removed['Grade']):
+            self.aggregate.remove(semester, int(credits), grade)
+
+        keep = np.ones(self._size, dtype=bool)
+        keep[indices] = False
+        remaining = int(keep.sum())
+        # Compact into new buffers: frames handed out earlier keep viewing the old ones
+        for name, column in self._columns.items():
+            compacted = np.empty(len(column), dtype=column.dtype)
+            compacted[:remaining] = column[:self._size][keep]
+            self._columns[name] = compacted
+        self._shared = False
+        self._size = remaining
+        self.changes.append(('delete', removed_ids))
+        self._changed()
+        self.edit_version = self.version
+
+    def delete_rows(self, row_ids):
+        """Delete the courses with the given row ids; ids no longer in the store are skipped."""
+        positions = self._positions(row_ids)
+        self.delete_courses(positions[positions >= 0])
+
+    def replace_with(self, other):
+        """Take over another store's courses in place, as one edit for every consumer of this store."""
+        self._size = other._size
+        self._semesters = other._semesters
+        self._grades = other._grades
+        self._columns = other._columns
+        self.aggregate = other.aggregate
+        self._shared = other._shared
+        self.changes = []
+        self.version = max(self.version, other.version) + 1
+        self.edit_version = self.version
+        self._frame = None
+
+    def frame(self):
+        """Return a DataFrame view of the courses, rebuilt only after a change."""
+        if self._frame is None:
+            n = self._size
+            columns = self._columns
+            self._frame = pd.DataFrame({
+                'Semester': self._semesters.categorical(columns['Semester'][:n]),
+                'Course Code': pd.Series(columns['Course Code'][:n], dtype=object, copy=False),
+                'Course Name': pd.Series(columns['Course Name'][:n], dtype=object, copy=False),
+                'Credits': columns['Credits'][:n],
+                'Grade': self._grades.categorical(columns['Grade'][:n]),
+                'Timestamp': columns['Timestamp'][:n],
+            }, columns=COURSE_COLUMNS, copy=False)
+            self._shared = True
+        return self._frame